@@ -7,28 +7,16 @@ Combining OTP result, Bifid cipher, and dots pattern
 import hashlib
 import binascii
 
-# Load all the data
-with open('dbbi_block.txt', 'r') as f:
-    dbbi_block = f.read().strip()
+from nesrd3q import blocks
+from nesrd3q.ciphers import OTP_KEY, otp_decrypt
+from nesrd3q.core import *
 
-with open('faed_block.txt', 'r') as f:
-    faed_block = f.read().strip()
+# Load all the data
+dbbi_block = blocks.dbbi_block()
+faed_block = blocks.faed_block()
 
 # OTP decryption result
-otp_key = "INCASEYOUMANAGETOCRACKTHISTHEPRIVATEKEYSBELONGTOHALFANDBETTERHALFANDTHEYALSONEEDEDFUNDSTOLIVE"
-
-def otp_decrypt(ciphertext, key):
-    result = []
-    for i, c in enumerate(ciphertext):
-        if c.isalpha():
-            k = key[i % len(key)]
-            c_val = ord(c.upper()) - ord('A')
-            k_val = ord(k.upper()) - ord('A')
-            p_val = (c_val - k_val) % 26
-            result.append(chr(p_val + ord('A')))
-        else:
-            result.append(c)
-    return ''.join(result)
+otp_key = OTP_KEY
 
 otp_result = otp_decrypt(dbbi_block, otp_key)
 otp_64 = otp_result[27:]  # 64 chars after YOUWON
@@ -245,56 +233,9 @@ print("=" * 70)
 
 def validate_btc_key(hex_key, target_address):
     """Check if a hex private key generates the target Bitcoin address."""
-    try:
-        # This requires ecdsa library
-        import ecdsa
-        import hashlib
-        
-        # Convert hex to bytes
-        private_key_bytes = bytes.fromhex(hex_key)
-        
-        # Generate public key
-        sk = ecdsa.SigningKey.from_string(private_key_bytes, curve=ecdsa.SECP256k1)
-        vk = sk.get_verifying_key()
-        
-        # Uncompressed public key
-        public_key = b'\x04' + vk.to_string()
-        
-        # SHA256
-        sha256_hash = hashlib.sha256(public_key).digest()
-        
-        # RIPEMD160
-        ripemd160 = hashlib.new('ripemd160')
-        ripemd160.update(sha256_hash)
-        hash160 = ripemd160.digest()
-        
-        # Add version byte (0x00 for mainnet)
-        versioned = b'\x00' + hash160
-        
-        # Double SHA256 for checksum
-        checksum = hashlib.sha256(hashlib.sha256(versioned).digest()).digest()[:4]
-        
-        # Base58 encode
-        address_bytes = versioned + checksum
-        
-        # Base58 encoding
-        alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
-        num = int.from_bytes(address_bytes, 'big')
-        result = ''
-        while num > 0:
-            num, rem = divmod(num, 58)
-            result = alphabet[rem] + result
-        
-        # Add leading 1s for leading zero bytes
-        for byte in address_bytes:
-            if byte == 0:
-                result = '1' + result
-            else:
-                break
-        
-        return result == target_address, result
-    except Exception as e:
-        return False, str(e)
+    addresses = private_key_to_address(hex_key)
+    match = any(addr == target_address for _, addr in addresses)
+    return match, addresses[0][1]
 
 # Target address
 target = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
@@ -314,10 +255,6 @@ print(f"Target address: {target}\n")
 for name, key in candidates:
     if len(key) == 64 and all(c in '0123456789abcdef' for c in key):
         try:
-            # Try to install ecdsa if not present
-            import subprocess
-            subprocess.run(['pip3', 'install', 'ecdsa', '-q'], capture_output=True)
-            
             match, generated = validate_btc_key(key, target)
             status = "MATCH!" if match else f"Generated: {generated[:20]}..."
             print(f"{name}: {key[:32]}... -> {status}")
@@ -0,0 +1,9 @@
+"""
+NESRD3Q puzzle search tools
+nesrd3q.core holds the key and address code, nesrd3q.ciphers and
+nesrd3q.blocks the puzzle text helpers; every search is a subcommand of the
+nesrd3q command (see nesrd3q.cli).  Nothing is imported up front, so a
+subcommand only loads what it uses.
+"""
+
+__version__ = '0.1.0'
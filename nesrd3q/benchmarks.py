@@ -0,0 +1,298 @@
+"""
+Benchmarks for the pure-Python secp256k1 code
+Usage: nesrd3q benchmarks [name ...]   (default: run all)
+"""
+
+import hashlib
+import os
+import random
+import sys
+import time
+
+from .core import *
+from .core import _hashlib_ripemd160_32
+
+def affine_scalar_mult(k, point, p):
+    """The original affine double-and-add (one inversion per step)."""
+    result = None
+    addend = point
+    while k:
+        if k & 1:
+            result = point_add(result, addend, p)
+        addend = point_add(addend, addend, p)
+        k >>= 1
+    return result
+
+def timed(fn, args_list):
+    """Run fn over args_list and return (seconds per call, results)."""
+    start = time.perf_counter()
+    results = [fn(*args) for args in args_list]
+    return (time.perf_counter() - start) / len(args_list), results
+
+def bench_scalar_mult(count=200):
+    """Variable-base scalar multiplication: binary vs wNAF vs GLV."""
+    p = SECP256K1_P
+    rng = random.Random(1)
+    bases = [scalar_mult(rng.randrange(1, SECP256K1_N), SECP256K1_G, p) for _ in range(8)]
+    jobs = [(rng.randrange(1, SECP256K1_N), bases[i % len(bases)], p) for i in range(count)]
+
+    print(f"Variable-base scalar multiplication ({count} random scalars)")
+    reference = None
+    for name, fn in [('affine double-and-add', affine_scalar_mult),
+                     ('scalar_mult (Jacobian)', scalar_mult),
+                     ('scalar_mult_wnaf (w=5)', scalar_mult_wnaf),
+                     ('scalar_mult_glv (w=5)', scalar_mult_glv)]:
+        per_call, results = timed(fn, jobs)
+        if reference is None:
+            reference = results
+        ok = 'ok' if results == reference else 'MISMATCH'
+        print(f"  {name:<26} {per_call * 1e3:8.3f} ms/op  {1 / per_call:9.0f} ops/s  {ok}")
+
+    load_g_table()
+    per_call, results = timed(fixed_base_mult, [(k,) for k, _, _ in jobs])
+    print(f"  {'fixed_base_mult (k*G)':<26} {per_call * 1e3:8.3f} ms/op  {1 / per_call:9.0f} ops/s")
+
+def bench_hash160(count=2000):
+    """Single-block RIPEMD-160 kernels, checked against hashlib."""
+    rng = random.Random(2)
+    messages = [rng.randbytes(32) for _ in range(count)]
+    g_compressed = b'\x02' + SECP256K1_GX.to_bytes(32, 'big')
+    g_uncompressed = b'\x04' + SECP256K1_GX.to_bytes(32, 'big') + SECP256K1_GY.to_bytes(32, 'big')
+    vectors = [(g_compressed, '751e76e8199196d454941c45d1b3a323f1433bd6'),
+               (g_uncompressed, '91b24bf9f5288532960ac687abb035127b1d28a5')]
+
+    print(f"RIPEMD-160 of 32-byte digests ({count} random messages)")
+    for data, expected in vectors:
+        digest = hashlib.sha256(data).digest()
+        ok = ripemd160_32_pure(digest).hex() == expected and hash160(data).hex() == expected
+        print(f"  hash160({data[:1].hex()}.. G) = {expected}  {'ok' if ok else 'MISMATCH'}")
+
+    try:
+        reference = [hashlib.new('ripemd160', m).digest() for m in messages]
+    except ValueError:
+        reference = None
+        print("  hashlib has no ripemd160; only the vectors above are checked")
+
+    kernels = [('hashlib', lambda: [_hashlib_ripemd160_32(m) for m in messages]),
+               ('ripemd160_32_pure', lambda: [ripemd160_32_pure(m) for m in messages])]
+    try:
+        import numpy  # noqa: F401
+        kernels.append(('ripemd160_32_many (NumPy)', lambda: ripemd160_32_many(messages)))
+    except ImportError:
+        print("  NumPy not installed; skipping the lane-parallel kernel")
+
+    for name, run in kernels:
+        try:
+            start = time.perf_counter()
+            results = run()
+        except ValueError:
+            continue
+        per_hash = (time.perf_counter() - start) / count
+        ok = 'ok' if reference is None or results == reference else 'MISMATCH'
+        print(f"  {name:<26} {per_hash * 1e6:8.2f} us/hash  {1 / per_hash:9.0f} hashes/s  {ok}")
+
+def bench_target_index(count=100000, lookups=20000):
+    """Target lookups: in-memory set vs the mmap'd index (bloom + search)."""
+    rng = random.Random(3)
+    hashes = [rng.randbytes(20) for _ in range(count)]
+    misses = [rng.randbytes(20) for _ in range(lookups)]
+    path = f'bench_targets.{os.getpid()}.idx'
+    start = time.perf_counter()
+    build_target_index((hash160_to_address(h) for h in hashes), path)
+    print(f"Target index of {count:,} P2PKH targets, built in {time.perf_counter() - start:.1f}s "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+    try:
+        targets = set(hashes)
+        per_hit, _ = timed(targets.__contains__, [(h,) for h in hashes[:lookups]])
+        per_miss, _ = timed(targets.__contains__, [(h,) for h in misses])
+        print(f"  {'set':<26} hit {per_hit * 1e6:6.2f} us  miss {per_miss * 1e6:6.2f} us")
+        for search in ('binary', 'interpolation'):
+            index = TargetIndex(path, search)
+            per_hit, found = timed(index.lookup, [(h,) for h in hashes[:lookups]])
+            per_miss, missed = timed(index.lookup, [(h,) for h in misses])
+            ok = 'ok' if all(found) and not any(missed) else 'MISMATCH'
+            print(f"  {'index (' + search + ')':<26} hit {per_hit * 1e6:6.2f} us  miss {per_miss * 1e6:6.2f} us  {ok}")
+        false_positives = sum(map(index.might_contain, misses)) / lookups
+        print(f"  bloom false-positive rate {false_positives:.2%}")
+    finally:
+        os.remove(path)
+
+def bench_ec_backends(count=2000):
+    """Keys/sec of every importable EC backend through the batch API."""
+    rng = random.Random(4)
+    keys = [rng.randrange(1, SECP256K1_N) for _ in range(count)]
+    print(f"EC backends ({count} random keys; k*G alone and k -> both hash160s)")
+    selected = select_ec_backend()
+    print(f"  auto-selected: {selected}")
+    reference = None
+    try:
+        for name in EC_BACKENDS:
+            if name not in available_ec_backends():
+                print(f"  {name:<12} not installed")
+                continue
+            per_key, points = time_ec_backend(name, keys)
+            reference = reference or points
+            select_ec_backend(name)
+            start = time.perf_counter()
+            for _ in private_keys_to_hash160s(keys):
+                pass
+            pipeline = (time.perf_counter() - start) / count
+            ok = 'ok' if points == reference else 'MISMATCH'
+            print(f"  {name:<12} {1 / per_key:9.0f} keys/s (k*G)  {1 / pipeline:9.0f} keys/s (hash160s)  {ok}")
+    finally:
+        select_ec_backend(selected)
+
+def bench_interval(bits=(20, 28, 32), trials=3):
+    """Interval discrete logs: sequential sweep (estimated) vs BSGS vs kangaroo."""
+    rng = random.Random(5)
+    load_g_table()
+    sample = 1 << 14
+    start = time.perf_counter()
+    for _ in walk_progression(SECP256K1_G, SECP256K1_G, sample):
+        pass
+    per_key = (time.perf_counter() - start) / sample
+    workers = os.cpu_count() or 1
+    print(f"Interval discrete logs ({trials} random keys per width; sweep at {1 / per_key:,.0f} keys/s)")
+    for b in bits:
+        width = 1 << b
+        timings = {'sweep (est.)': per_key * width / 2, 'bsgs': 0.0, 'kangaroo': 0.0}
+        if workers > 1:
+            timings[f'kangaroo x{workers}'] = 0.0
+        ok = True
+        for _ in range(trials):
+            first = rng.randrange(1, SECP256K1_N - width)
+            key = rng.randrange(first, first + width)
+            point = ec_points([key])[0]
+            runs = [('bsgs', lambda: bsgs_solve(point, first, first + width - 1)),
+                    ('kangaroo', lambda: kangaroo_solve(point, first, first + width - 1)[0])]
+            if workers > 1:
+                runs.append((f'kangaroo x{workers}',
+                             lambda: kangaroo_solve(point, first, first + width - 1, workers)[0]))
+            for name, run in runs:
+                begin = time.perf_counter()
+                ok &= run() == key
+                timings[name] += (time.perf_counter() - begin) / trials
+        line = '  '.join(f"{name} {seconds:8.3f}s" for name, seconds in timings.items())
+        print(f"  2^{b:<3} {line}  {'ok' if ok else 'MISMATCH'}")
+
+def bench_parallel(count=50000):
+    """check_keys_parallel with 1, 2, 4 ... workers up to all cores, and its early stop.
+
+    1, 2 and 4 workers are always measured; counts above the number of
+    cores are marked as oversubscribed, since they cannot scale.
+    """
+    rng = random.Random(6)
+    keys = [rng.randrange(1, SECP256K1_N).to_bytes(32, 'big') for _ in range(count)]
+    absent = [private_key_to_address(format(rng.randrange(1, SECP256K1_N), '064x'))[1][1]]
+    cores = os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(max(cores, 4).bit_length())
+                     if 1 << i <= max(cores, 4)} | {cores})
+    start = time.perf_counter()
+    for _ in check_keys(keys, absent):
+        pass
+    serial = count / (time.perf_counter() - start)
+    print(f"Parallel key checking ({count} random keys, {cores} cores; serial {serial:,.0f} keys/s)")
+    for workers in counts:
+        start = time.perf_counter()
+        for _ in check_keys_parallel(keys, absent, workers):
+            pass
+        rate = count / (time.perf_counter() - start)
+        print(f"  {workers:>3} workers {rate:10,.0f} keys/s  x{rate / serial:5.2f}  "
+              f"{rate / serial / min(workers, cores):5.0%} per core"
+              + ("  (oversubscribed)" if workers > cores else ''))
+    hit = count // 2
+    target = [private_key_to_address(keys[hit].hex())[1][1]]
+    stats = {}
+    start = time.perf_counter()
+    found = [key for key, _, _ in check_keys_parallel(keys, target, cores, stop_on_hit=True, stats=stats)]
+    elapsed = time.perf_counter() - start
+    print(f"  stop on hit ({cores} workers): key {hit} found in {elapsed:.2f}s, "
+          f"{stats['tested'] - hit - 1:,} keys checked after it (batch {BATCH_SIZE})  "
+          f"{'ok' if found == [keys[hit]] else 'MISMATCH'}")
+
+def _hex_chunk(chunk):
+    return sum(int(key, 16) & 1 for key in chunk)
+
+def _bytes_chunk(chunk):
+    return sum(int.from_bytes(key, 'big') & 1 for key in chunk)
+
+def _drain_ring(ring, results):
+    total = 0
+    for keys, labels in ring.batches(BATCH_SIZE):
+        total += sum(int.from_bytes(keys[i:i + 32], 'big') & 1 for i in range(0, len(keys), 32))
+    ring.close()
+    results.put(total)
+
+def bench_ipc(count=200000, chunk=1024):
+    """Moving keys to a worker process: pickled chunks vs a shared-memory KeyRing."""
+    import multiprocessing
+    rng = random.Random(7)
+    keys = [rng.randbytes(32) for _ in range(count)]
+    hex_keys = [key.hex() for key in keys]
+    records = [(i & 0xffff, key) for i, key in enumerate(keys)]
+    expected = _bytes_chunk(keys)
+    per_million = lambda seconds: seconds * 1e6 / count
+
+    def pooled(worker, items):
+        with multiprocessing.Pool(1) as pool:
+            pool.apply(len, ([],))
+            results = [pool.apply_async(worker, (items[i:i + chunk],)) for i in range(0, count, chunk)]
+            return sum(result.get() for result in results)
+
+    def ring():
+        results = multiprocessing.Queue()
+        key_ring = KeyRing()
+        consumer = multiprocessing.Process(target=_drain_ring, args=(key_ring, results))
+        consumer.start()
+        try:
+            for i in range(0, count, chunk):
+                batch = records[i:i + chunk]
+                polls = 0
+                while batch:
+                    written = key_ring.write(batch)
+                    batch = batch[written:]
+                    if not written:
+                        KeyRing.wait(polls)
+                        polls += 1
+            key_ring.finish()
+            return results.get()
+        finally:
+            consumer.join()
+            key_ring.close()
+
+    start = time.perf_counter()
+    _bytes_chunk(keys)
+    baseline = time.perf_counter() - start
+    print(f"Key transport to one worker ({count:,} keys, {chunk} per task or write; the worker "
+          f"converts each key to an int, {per_million(baseline):.2f} s per million keys in-process)")
+    for name, run in [('pickled hex strings', lambda: pooled(_hex_chunk, hex_keys)),
+                      ('pickled 32-byte keys', lambda: pooled(_bytes_chunk, keys)),
+                      ('KeyRing (shared memory)', ring)]:
+        start = time.perf_counter()
+        cpu = time.process_time()
+        total = run()
+        cpu = time.process_time() - cpu
+        seconds = time.perf_counter() - start
+        print(f"  {name:<24} {per_million(seconds):6.2f} s per million keys "
+              f"(overhead {per_million(seconds - baseline):5.2f} s), "
+              f"producer CPU {per_million(cpu):5.2f} s  {'ok' if total == expected else 'MISMATCH'}")
+
+BENCHMARKS = {
+    'scalar_mult': bench_scalar_mult,
+    'hash160': bench_hash160,
+    'target_index': bench_target_index,
+    'ec_backends': bench_ec_backends,
+    'interval': bench_interval,
+    'parallel': bench_parallel,
+    'ipc': bench_ipc,
+}
+
+def main(argv=None, prog=None):
+    names = (sys.argv[1:] if argv is None else argv) or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark {name!r}; choose from {', '.join(BENCHMARKS)}")
+        BENCHMARKS[name]()
+
+if __name__ == '__main__':
+    main()
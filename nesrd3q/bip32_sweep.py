@@ -0,0 +1,86 @@
+"""
+BIP32 derivation-path sweep for one seed
+Sweeps path templates such as m/84'/0'/0'/0/* over an index range.  The
+nodes above the wildcard are derived once and shared between templates;
+each leaf then costs one HMAC-SHA512 and its own k * G, batched.
+
+Usage: nesrd3q bip32-sweep (--seed HEX | --mnemonic WORDS [--passphrase P])
+                           [--path TEMPLATE ...] [--range A-B]
+                           [--target ADDR ... | --index FILE]
+Templates end in /* or /*' (hardened leaves).  Default: the BIP32_TEMPLATES
+of nesrd3q.core (m/0/*, m/0'/*', BIP44/49/84/86 receive chains).
+"""
+
+import argparse
+import time
+
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+def sweep_seed(seed, templates, leaves, targets):
+    """Return (leaves derived, [(path, pk_type, key_hex, address)])."""
+    wanted = target_programs(targets)
+    tree = Bip32Tree(seed)
+    derived = 0
+    hits = []
+    for template in templates:
+        formats = enabled_formats(wanted, BIP32_TEMPLATES.get(template))
+        if not formats:
+            continue
+        for path, key, point in bip32_sweep(tree, [template], leaves):
+            derived += 1
+            for fmt, program in point_to_programs(point, formats):
+                if program in wanted[FORMAT_SPACES[fmt]]:
+                    hits.append((path, fmt, format(key, '064x'), program_to_address(fmt, program)))
+    return derived, hits
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--seed', help='BIP32 seed as hex')
+    source.add_argument('--mnemonic', help='BIP39 mnemonic (checksum is not verified)')
+    parser.add_argument('--passphrase', default='', help='BIP39 passphrase')
+    parser.add_argument('--path', action='append', help="path template ending in /* or /*' (repeatable)")
+    parser.add_argument('--range', default='0-99', help='leaf indices to sweep (default: 0-99)')
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    args = parser.parse_args(argv)
+
+    seed = bytes.fromhex(args.seed) if args.seed else mnemonic_to_seed(args.mnemonic, args.passphrase)
+    first, _, last = args.range.partition('-')
+    leaves = range(int(first), int(last or first) + 1)
+    templates = args.path or list(BIP32_TEMPLATES)
+    for template in templates:
+        try:
+            parse_bip32_template(template)
+        except ValueError as e:
+            parser.error(str(e))
+
+    print("=" * 70)
+    print("BIP32 PATH SWEEP")
+    print("=" * 70)
+    print(f"Templates: {', '.join(templates)}")
+    print(f"Leaves: {leaves.start}-{leaves.stop - 1}")
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    began = time.time()
+    derived, hits = sweep_seed(seed, templates, leaves, targets)
+    elapsed = time.time() - began
+
+    for path, pk_type, key, address in hits:
+        print(f"\n{'='*70}")
+        print("FOUND MATCH")
+        print(f"Path: {path}")
+        print(f"Key: {key}")
+        print(f"Type: {pk_type}")
+        print(f"Address: {address}")
+        print(f"{'='*70}")
+
+    print("\n" + "=" * 70)
+    print(f"Sweep complete. {derived:,} leaves in {elapsed:.1f}s "
+          f"({derived / max(elapsed, 1e-9):,.0f} leaves/s), {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
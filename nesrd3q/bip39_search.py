@@ -0,0 +1,270 @@
+"""
+BIP39 mnemonic search with checksum prefilter and parallel PBKDF2
+Candidate mnemonics come from a file (one per line) or from a grammar file
+with one line of alternatives per word position ('*' stands for every word
+of the wordlist).  Sequences with a wrong BIP39 checksum are rejected
+before any PBKDF2-HMAC-SHA512 work (15/16 of 12-word and 255/256 of
+24-word sequences); the survivors are stretched (2048 iterations) in a
+process pool and the first addresses of the standard BIP44/49/84/86
+accounts (or of other path templates) are checked against the targets.
+
+Usage: nesrd3q bip39-search --wordlist FILE (--mnemonics FILE | --grammar FILE)
+                            [--passphrase P ...] [--path TEMPLATE ...] [--range A-B]
+                            [--workers N] [--batch B]
+                            [--target ADDR ... | --index FILE]
+                            [--checkpoint PATH [--resume] [--checkpoint-seconds S] [--checkpoint-count N]]
+The wordlist is a local copy of the 2048-word BIP39 list (e.g. english.txt).
+With --checkpoint the search saves how many candidates are done; --resume
+skips that many of the same mnemonic file or grammar.
+"""
+
+import argparse
+import collections
+import hashlib
+import itertools
+import multiprocessing
+import time
+import unicodedata
+
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+# External chain of the first account of each standard wallet layout
+BIP39_TEMPLATES = ("m/44'/0'/0'/0/*", "m/49'/0'/0'/0/*", "m/84'/0'/0'/0/*", "m/86'/0'/0'/0/*")
+
+MNEMONIC_LENGTHS = (12, 15, 18, 21, 24)
+
+# Mnemonics handed to a worker per task (each costs one PBKDF2 run)
+MNEMONIC_BATCH = 64
+
+def load_wordlist(path):
+    """Read a BIP39 wordlist: 2048 distinct words, one per line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        words = [unicodedata.normalize('NFKD', line.strip()) for line in f if line.strip()]
+    if len(words) != 2048 or len(set(words)) != 2048:
+        raise ValueError(f'Not a BIP39 wordlist (need 2048 distinct words): {path}')
+    return words
+
+def checksum_ok(indices):
+    """True if the word indices form a mnemonic with a valid BIP39 checksum."""
+    if len(indices) not in MNEMONIC_LENGTHS:
+        return False
+    value = 0
+    for i in indices:
+        value = (value << 11) | i
+    checksum_bits = len(indices) * 11 // 33
+    entropy = (value >> checksum_bits).to_bytes(checksum_bits * 4, 'big')
+    return hashlib.sha256(entropy).digest()[0] >> (8 - checksum_bits) == value & ((1 << checksum_bits) - 1)
+
+def parse_grammar(path, wordlist):
+    """Read a grammar file into a list of word-index alternatives per position.
+
+    Each non-empty line is one position: words separated by spaces or '|',
+    or '*' for the whole wordlist.  '#' starts a comment.
+    """
+    index_of = {w: i for i, w in enumerate(wordlist)}
+    positions = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            tokens = line.split('#', 1)[0].replace('|', ' ').split()
+            if not tokens:
+                continue
+            if tokens == ['*']:
+                positions.append(list(range(len(wordlist))))
+                continue
+            unknown = [t for t in tokens if unicodedata.normalize('NFKD', t.lower()) not in index_of]
+            if unknown:
+                raise ValueError(f'Not in the wordlist: {", ".join(unknown)}')
+            positions.append(sorted({index_of[unicodedata.normalize('NFKD', t.lower())] for t in tokens}))
+    if len(positions) not in MNEMONIC_LENGTHS:
+        raise ValueError(f'Grammar has {len(positions)} positions; need one of {MNEMONIC_LENGTHS}')
+    return positions
+
+def grammar_candidates(positions):
+    """Yield every word-index tuple of the grammar."""
+    return itertools.product(*positions)
+
+def mnemonic_file_candidates(path, wordlist):
+    """Yield word-index tuples for the lines of a mnemonic file (bad lines are skipped)."""
+    index_of = {w: i for i, w in enumerate(wordlist)}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            words = unicodedata.normalize('NFKD', line.lower()).split()
+            if words and all(w in index_of for w in words):
+                yield tuple(index_of[w] for w in words)
+
+def check_seed(seed, templates, leaves, wanted):
+    """Return [(path, pk_type, key_hex, address)] for the targets among the seed's addresses."""
+    hits = []
+    tree = Bip32Tree(seed)
+    for template, formats in templates.items():
+        for path, key, point in bip32_sweep(tree, [template], leaves):
+            for fmt, program in point_to_programs(point, formats):
+                if program in wanted[FORMAT_SPACES[fmt]]:
+                    hits.append((path, fmt, format(key, '064x'), program_to_address(fmt, program)))
+    return hits
+
+_job = None
+
+def _init_worker(job):
+    global _job
+    _job = job
+
+def _check_task(candidates):
+    wordlist, passphrases, templates, leaves, wanted = _job
+    hits = []
+    for indices in candidates:
+        mnemonic = ' '.join(wordlist[i] for i in indices)
+        for passphrase in passphrases:
+            for hit in check_seed(mnemonic_to_seed(mnemonic, passphrase), templates, leaves, wanted):
+                hits.append((mnemonic, passphrase) + hit)
+    return len(candidates), hits
+
+def template_formats(templates, wanted):
+    """{template: enabled formats} for the templates with any enabled format."""
+    result = {}
+    for template in templates:
+        formats = enabled_formats(wanted, BIP32_TEMPLATES.get(template))
+        if formats:
+            result[template] = formats
+    return result
+
+def run_bip39(candidates, wordlist, targets, passphrases=('',), leaves=range(1),
+              templates=BIP39_TEMPLATES, workers=None, batch_size=MNEMONIC_BATCH,
+              checkpoint=None, state=None):
+    """Checksum-filter candidates and check the survivors across worker processes.
+
+    Batches are collected in candidate order, so a Checkpoint gets the
+    number of candidates up to the last collected batch with the valid
+    checksums and hits so far; state is such a saved state, whose
+    candidates are skipped.
+    """
+    wanted = target_programs(targets)
+    templates = template_formats(templates, wanted)
+    workers = workers or multiprocessing.cpu_count()
+    if select_ec_backend() == 'pure':
+        load_g_table()
+
+    enumerated = 0
+    checked = 0
+    hits = []
+    if state:
+        enumerated, checked = state['candidates'], state['checked']
+        hits = [tuple(hit) for hit in state['hits']]
+        print(f"Resuming after {enumerated:,} candidates: {checked:,} valid checksums, "
+              f"{len(hits)} match(es) so far")
+        candidates = itertools.islice(candidates, enumerated, None)
+    done = enumerated       # candidates up to the last collected batch
+    resumed = checked
+    began = time.time()
+
+    def current():
+        return {'candidates': done, 'checked': checked, 'hits': hits}
+
+    def valid():
+        nonlocal enumerated
+        for indices in candidates:
+            enumerated += 1
+            if checksum_ok(indices):
+                yield indices
+
+    def collect(task):
+        nonlocal checked, done
+        end, result = task
+        count, batch_hits = result.get()
+        done = end
+        checked += count
+        for mnemonic, passphrase, path, pk_type, key, address in batch_hits:
+            print(f"\n{'='*70}")
+            print("FOUND MATCH")
+            print(f"Mnemonic: {mnemonic}")
+            print(f"Passphrase: {passphrase!r}")
+            print(f"Path: {path}")
+            print(f"Key: {key}")
+            print(f"Type: {pk_type}")
+            print(f"Address: {address}")
+            print(f"{'='*70}")
+            hits.append((mnemonic, passphrase, path, pk_type, key, address))
+        if checkpoint:
+            checkpoint.update(done, current)
+        elapsed = time.time() - began
+        print(f"  {enumerated:,} candidates  {checked:,} valid checksums  "
+              f"{(checked - resumed) * len(passphrases) / elapsed:,.0f} seeds/s",
+              end='\r', flush=True)
+
+    job = (wordlist, tuple(passphrases), templates, list(leaves), wanted)
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(job,)) as pool:
+            # A bounded number of tasks in flight keeps memory flat for huge grammars
+            pending = collections.deque()
+            batch = []
+            for indices in valid():
+                batch.append(indices)
+                if len(batch) >= batch_size:
+                    pending.append((enumerated, pool.apply_async(_check_task, (batch,))))
+                    batch = []
+                    if len(pending) >= 2 * workers:
+                        collect(pending.popleft())
+            if batch:
+                pending.append((enumerated, pool.apply_async(_check_task, (batch,))))
+            while pending:
+                collect(pending.popleft())
+            # The candidates after the last valid checksum need no work
+            done = enumerated
+    finally:
+        # Also on errors and interrupts: the count covers collected batches only
+        if checkpoint:
+            checkpoint.save(current(), done)
+
+    print(f"\n  {enumerated - checked:,} of {enumerated:,} candidates rejected by checksum")
+    return hits
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--wordlist', required=True, help='BIP39 wordlist file (2048 words)')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--mnemonics', help='file with one candidate mnemonic per line')
+    source.add_argument('--grammar', help='file with the alternatives of one word position per line')
+    parser.add_argument('--passphrase', action='append', help='BIP39 passphrase (repeatable, default: empty)')
+    parser.add_argument('--path', action='append',
+                        help="path template ending in /* or /*' (repeatable, default: BIP44/49/84/86)")
+    parser.add_argument('--range', default='0-0', help='leaf indices to sweep, e.g. 0-19 (default: 0-0)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--batch', type=int, default=MNEMONIC_BATCH, help='mnemonics per worker task')
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args(argv)
+
+    wordlist = load_wordlist(args.wordlist)
+    checkpoint, state = open_checkpoint(parser, args, {
+        'command': 'bip39-search', 'wordlist': args.wordlist, 'mnemonics': args.mnemonics,
+        'grammar': args.grammar, 'passphrase': args.passphrase, 'path': args.path,
+        'range': args.range, 'target': args.target, 'index': args.index})
+
+    print("=" * 70)
+    print("BIP39 MNEMONIC SEARCH")
+    print("=" * 70)
+    if args.grammar:
+        positions = parse_grammar(args.grammar, wordlist)
+        total = 1
+        for alternatives in positions:
+            total *= len(alternatives)
+        print(f"Grammar: {len(positions)} words, {total:,} sequences")
+        candidates = grammar_candidates(positions)
+    else:
+        candidates = mnemonic_file_candidates(args.mnemonics, wordlist)
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    first, _, last = args.range.partition('-')
+    leaves = range(int(first), int(last or first) + 1)
+    hits = run_bip39(candidates, wordlist, targets, args.passphrase or [''], leaves,
+                     args.path or BIP39_TEMPLATES, args.workers, args.batch, checkpoint, state)
+
+    print("\n" + "=" * 70)
+    print(f"Search complete. {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""
+Loaders for the puzzle's DBBI and FAED text blocks
+The block files (dbbi_block.txt, faed_block.txt, written by
+solve_puzzle.py) are looked up in NESRD3Q_DATA_DIR, default the current
+directory, and read once per process.
+"""
+
+import functools
+import os
+
+from .ciphers import otp_decrypt
+
+DATA_DIR = os.environ.get('NESRD3Q_DATA_DIR', '.')
+
+# The 64 OTP characters that follow "YOUWON" in the decrypted DBBI block
+OTP_64_OFFSET = 27
+
+@functools.lru_cache(maxsize=None)
+def read_block(name):
+    """Return the stripped contents of DATA_DIR/<name>_block.txt."""
+    with open(os.path.join(DATA_DIR, f'{name}_block.txt'), 'r') as f:
+        return f.read().strip()
+
+def dbbi_block():
+    return read_block('dbbi')
+
+def faed_block():
+    return read_block('faed')
+
+def otp_64():
+    """The 64-character OTP plaintext after "YOUWON"."""
+    return otp_decrypt(dbbi_block())[OTP_64_OFFSET:]
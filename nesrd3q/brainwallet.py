@@ -0,0 +1,215 @@
+"""
+Streaming brainwallet search over local phrase files
+Every phrase is expanded into encoding variants (as written, lower and
+upper case, each with and without a trailing newline, and hex-decoded when
+the phrase is hex) and every variant is hashed into keys with SHA-256,
+double SHA-256 and optionally more SHA-256 rounds.  Phrases are read
+lazily and only a few batches are in flight at a time, so memory does not
+grow with the size of the input.
+
+Usage: nesrd3q brainwallet FILE ... [--rounds 1,2,...] [--workers N] [--batch B]
+                           [--types FORMATS] [--target ADDR ... | --index FILE]
+                           [--checkpoint PATH [--resume] [--checkpoint-seconds S] [--checkpoint-count N]]
+FILE may be - for stdin; one phrase per line.  With --checkpoint the search
+saves how many phrases are done; --resume skips that many of the same
+input.
+"""
+
+import argparse
+import collections
+import hashlib
+import itertools
+import multiprocessing
+import sys
+import time
+
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+# SHA-256 rounds turned into keys: 1 is SHA256(phrase), 2 is double SHA-256
+ROUNDS = (1, 2)
+
+# Phrases handed to a worker per task
+PHRASE_BATCH = 256
+
+def read_phrases(paths):
+    """Yield the lines of the given files (- is stdin) without line endings."""
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', errors='surrogateescape')
+        try:
+            for line in f:
+                phrase = line.rstrip('\r\n')
+                if phrase:
+                    yield phrase
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+def phrase_variants(phrase):
+    """Yield (label, bytes) for every distinct encoding variant of phrase."""
+    seen = set()
+    cases = (('utf-8', phrase), ('lower', phrase.lower()), ('upper', phrase.upper()))
+    for label, text in cases:
+        data = text.encode('utf-8', 'surrogateescape')
+        for suffix, variant in (('', data), ('+newline', data + b'\n')):
+            if variant not in seen:
+                seen.add(variant)
+                yield label + suffix, variant
+    if len(phrase) % 2 == 0 and HEX_DIGITS.issuperset(phrase):
+        data = bytes.fromhex(phrase)
+        if data not in seen:
+            yield 'hex-decoded', data
+
+def phrase_keys(phrase, rounds=ROUNDS):
+    """Yield (label, 32-byte key) for every variant of phrase and SHA-256 round count."""
+    last = max(rounds)
+    for variant, data in phrase_variants(phrase):
+        digest = data
+        for i in range(1, last + 1):
+            digest = hashlib.sha256(digest).digest()
+            if i in rounds:
+                name = 'sha256' if i == 1 else f'sha256^{i}'
+                yield f'{name}({variant})', digest
+
+def check_phrases(phrases, wanted, formats, rounds=ROUNDS):
+    """Return (keys tested, [(description, key_hex, pk_type, address)])."""
+    labels = {}
+    for phrase in phrases:
+        for label, key in phrase_keys(phrase, rounds):
+            labels.setdefault(key, []).append(f'{label} of {phrase!r}')
+    hits = []
+    for key, point in private_keys_to_points(labels):
+        for fmt, program in point_to_programs(point, formats):
+            if program in wanted[FORMAT_SPACES[fmt]]:
+                address = program_to_address(fmt, program)
+                hits.extend((label, key.hex(), fmt, address) for label in labels[key])
+    return len(labels), hits
+
+_job = None
+
+def _init_worker(job):
+    global _job
+    _job = job
+
+def _check_task(phrases):
+    wanted, formats, rounds = _job
+    return len(phrases), check_phrases(phrases, wanted, formats, rounds)
+
+def batched(items, size):
+    """Yield lists of up to size consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def run_brainwallet(phrases, targets, rounds=ROUNDS, workers=None, batch_size=PHRASE_BATCH,
+                    formats=P2PKH_FORMATS, checkpoint=None, state=None):
+    """Check every key derived from phrases across worker processes; return hits.
+
+    Batches are collected in input order, so a Checkpoint gets the number
+    of phrases whose batches are done with the keys and hits so far; state
+    is such a saved state, whose phrases are skipped.
+    """
+    wanted = target_programs(targets)
+    formats = enabled_formats(wanted, formats)
+    workers = workers or multiprocessing.cpu_count()
+    # Probe once in the parent so forked workers inherit the choice
+    if select_ec_backend() == 'pure':
+        load_g_table()
+
+    phrase_count = 0
+    key_count = 0
+    hits = []
+    if state:
+        phrase_count, key_count = state['phrases'], state['keys']
+        hits = [tuple(hit) for hit in state['hits']]
+        print(f"Resuming after {phrase_count:,} phrases: {key_count:,} keys tested, "
+              f"{len(hits)} match(es) so far")
+        phrases = itertools.islice(phrases, phrase_count, None)
+    resumed = key_count
+    began = time.time()
+
+    def current():
+        return {'phrases': phrase_count, 'keys': key_count, 'hits': hits}
+
+    def collect(result):
+        nonlocal phrase_count, key_count
+        count, (tested, batch_hits) = result
+        phrase_count += count
+        key_count += tested
+        for label, key, pk_type, address in batch_hits:
+            print(f"\n{'='*70}")
+            print(f"FOUND MATCH: {label}")
+            print(f"Key: {key}")
+            print(f"Type: {pk_type}")
+            print(f"Address: {address}")
+            print(f"{'='*70}")
+            hits.append((label, key, pk_type, address))
+        if checkpoint:
+            checkpoint.update(key_count, current)
+        elapsed = time.time() - began
+        print(f"  {phrase_count:,} phrases  {key_count:,} keys  "
+              f"{(key_count - resumed) / elapsed:,.0f} keys/s", end='\r', flush=True)
+
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=((wanted, formats, tuple(rounds)),)) as pool:
+            # Pool.imap would drain the phrase iterator up front; keeping a fixed
+            # number of tasks in flight bounds memory for any input size
+            pending = collections.deque()
+            for batch in batched(phrases, batch_size):
+                pending.append(pool.apply_async(_check_task, (batch,)))
+                if len(pending) >= 2 * workers:
+                    collect(pending.popleft().get())
+            while pending:
+                collect(pending.popleft().get())
+    finally:
+        # Also on errors and interrupts: the count covers collected batches only
+        if checkpoint:
+            checkpoint.save(current(), key_count)
+
+    print()
+    return hits
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='+', help='phrase files (- for stdin)')
+    parser.add_argument('--rounds', default=','.join(map(str, ROUNDS)),
+                        help='comma-separated SHA-256 round counts to try (default: 1,2)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--batch', type=int, default=PHRASE_BATCH, help='phrases per worker task')
+    parser.add_argument('--types', default='uncompressed,compressed',
+                        help='comma-separated address formats to check: ' + ','.join(ADDRESS_FORMATS))
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args(argv)
+
+    rounds = sorted({int(r) for r in args.rounds.split(',')})
+    if rounds[0] < 1:
+        parser.error('rounds must be at least 1')
+    types = tuple(args.types.split(','))
+    checkpoint, state = open_checkpoint(parser, args, {
+        'command': 'brainwallet', 'files': args.files, 'rounds': rounds, 'types': types,
+        'target': args.target, 'index': args.index})
+
+    print("=" * 70)
+    print("BRAINWALLET SEARCH")
+    print("=" * 70)
+    print(f"SHA-256 rounds: {', '.join(map(str, rounds))}")
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    hits = run_brainwallet(read_phrases(args.files), targets, rounds, args.workers, args.batch,
+                           types, checkpoint, state)
+
+    print("\n" + "=" * 70)
+    print(f"Search complete. {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Classical cipher helpers for the DBBI and FAED blocks
+The one-time pad of the DBBI block and the 3x3 Bifid (Polybius square over
+a-i) tried on the FAED block.
+"""
+
+# OTP key from the puzzle
+OTP_KEY = "INCASEYOUMANAGETOCRACKTHISTHEPRIVATEKEYSBELONGTOHALFANDBETTERHALFANDTHEYALSONEEDEDFUNDSTOLIVE"
+
+def otp_decrypt(ciphertext, key=OTP_KEY):
+    """OTP decryption: (ciphertext - key) mod 26."""
+    result = []
+    for i, c in enumerate(ciphertext):
+        if c.isalpha():
+            k = key[i % len(key)]
+            c_val = ord(c.upper()) - ord('A')
+            k_val = ord(k.upper()) - ord('A')
+            p_val = (c_val - k_val) % 26
+            result.append(chr(p_val + ord('A')))
+        else:
+            result.append(c)
+    return ''.join(result)
+
+def create_square(keyword, alphabet='abcdefghi'):
+    """Create Polybius square from keyword."""
+    square = []
+    seen = set()
+    for c in keyword.lower():
+        if c in alphabet and c not in seen:
+            square.append(c)
+            seen.add(c)
+    for c in alphabet:
+        if c not in seen:
+            square.append(c)
+            seen.add(c)
+    return ''.join(square)
+
+def bifid_decrypt(ciphertext, square, size=3):
+    """Decrypt using Bifid cipher (no period)."""
+    coords = []
+    for char in ciphertext.lower():
+        if char in square:
+            idx = square.index(char)
+            coords.append((idx // size, idx % size))
+    
+    n = len(coords)
+    combined = [r for r, _ in coords] + [c for _, c in coords]
+    rows = combined[:n]
+    cols = combined[n:]
+    return ''.join(square[rows[i] * size + cols[i]] for i in range(n))
@@ -0,0 +1,43 @@
+"""
+The nesrd3q command: one subcommand per search tool
+Usage: nesrd3q COMMAND [ARGS ...]   (nesrd3q COMMAND --help for its options)
+Only the chosen command's module is imported, so listing the commands or
+printing one command's help does not load the EC code.
+"""
+
+import importlib
+import sys
+
+# Command -> (module, summary); the summaries are kept here so that the
+# command list needs no imports
+COMMANDS = {
+    'range-scan': ('range_scan', 'sequential keyspace range scan'),
+    'window-scan': ('window_scan', 'rolling 64-digit windows over the dbbi/faed blocks'),
+    'mapping-search': ('mapping_search', 'letter-to-hex mapping space of the OTP key material'),
+    'strategies': ('strategies', 'registered candidate strategies over the DBBI/FAED/OTP material'),
+    'neighbourhood-search': ('neighbourhood_search', 'Hamming neighbourhood of a candidate key'),
+    'brainwallet': ('brainwallet', 'streaming brainwallet search over phrase files'),
+    'wif-search': ('wif_search', 'WIF candidates from text files'),
+    'bip39-search': ('bip39_search', 'BIP39 mnemonics from a list or a grammar'),
+    'bip32-sweep': ('bip32_sweep', 'BIP32 path templates of one seed'),
+    'interval-search': ('interval_search', 'kangaroo / BSGS over an interval for a known public key'),
+    'target-index': ('target_index', 'build and query target index files'),
+    'benchmarks': ('benchmarks', 'benchmarks of the EC, hashing and lookup code'),
+}
+
+def usage():
+    width = max(map(len, COMMANDS))
+    lines = [__doc__.strip().splitlines()[1], '', 'Commands:']
+    lines += [f'  {name:<{width}}  {summary}' for name, (_, summary) in COMMANDS.items()]
+    return '\n'.join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    if argv[0] not in COMMANDS:
+        print(f"nesrd3q: unknown command {argv[0]!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+    module = importlib.import_module(f'{__package__}.{COMMANDS[argv[0]][0]}')
+    return module.main(argv[1:], prog=f'nesrd3q {argv[0]}') or 0
@@ -0,0 +1,2564 @@
+"""
+Bitcoin key and address primitives for the NESRD3Q search tools
+Pure Python secp256k1 arithmetic and hashing (uses hashlib with a fallback
+for RIPEMD160), address formats, target indexes, the key cache, BIP32/BIP39
+derivation and interval solvers.  The optional ecdsa, coincurve and NumPy
+speedups are imported only when first used.
+"""
+
+import array
+import collections
+import hashlib
+import hmac
+import math
+import mmap
+import os
+import random
+import struct
+import time
+import unicodedata
+
+# The public API; the root scripts use `from nesrd3q.core import *`
+__all__ = [
+    'ripemd160', 'ripemd160_32_pure', 'ripemd160_32', 'hash160',
+    'ripemd160_32_many', 'RIPEMD160_LANES_MIN', 'hash160_many',
+    'base58_encode', 'base58_decode', 'address_to_hash160',
+    'hash160_to_address', 'WIF_VERSION', 'WIF_FORMATS',
+    'base58check_decode_fixed', 'wif_decode', 'wif_encode', 'SECP256K1_P',
+    'SECP256K1_N', 'SECP256K1_GX', 'SECP256K1_GY', 'SECP256K1_G', 'point_add',
+    'to_jacobian', 'from_jacobian', 'jacobian_double', 'jacobian_add',
+    'jacobian_add_affine', 'scalar_mult', 'SECP256K1_LAMBDA',
+    'SECP256K1_BETA', 'wnaf', 'glv_split', 'scalar_mult_wnaf',
+    'scalar_mult_glv', 'batch_from_jacobian', 'batch_inverse',
+    'batch_add_affine', 'G_TABLE_PATH', 'G_TABLE_WINDOW', 'G_TABLE_WINDOWS',
+    'G_TABLE_ENTRIES', 'G_TABLE_SIZE', 'build_g_table', 'load_g_table',
+    'fixed_base_mult_jacobian', 'fixed_base_mult', 'EC_BACKENDS',
+    'EC_BACKEND_PROBE_KEYS', 'available_ec_backends', 'time_ec_backend',
+    'select_ec_backend', 'ec_points', 'ADDRESS_FORMATS', 'P2PKH_FORMATS',
+    'FORMAT_SPACES', 'BECH32_CHARSET', 'BECH32M_CONST', 'bech32_polymod',
+    'segwit_encode', 'segwit_decode', 'decode_address', 'program_to_address',
+    'target_programs', 'enabled_formats', 'tagged_hash', 'taproot_output_key',
+    'point_to_programs', 'TARGET_INDEX_MAGIC', 'TARGET_INDEX_HEADER',
+    'TARGET_INDEX_RECORD', 'TARGET_INDEX_BLOOM_BITS', 'TARGET_INDEX_BLOOM_K',
+    'SPACE_BITS', 'read_address_list', 'build_target_index', 'TargetIndex',
+    'TargetIndexSpace', 'open_target_index', 'private_key_to_address',
+    'SIBLINGS', 'SECP256K1_BETA2', 'sibling_points', 'sibling_key',
+    'point_to_hash160s', 'points_to_hash160s', 'private_key_to_int',
+    'HEX_DIGITS', 'candidate_private_key', 'KEY_CACHE_PATH',
+    'KEY_CACHE_MAX_ENTRIES', 'KEY_CACHE_MEMORY_ENTRIES', 'KeyCache',
+    'use_key_cache', 'BATCH_SIZE', 'private_keys_to_hash160s',
+    'private_keys_to_points', 'private_keys_to_addresses', 'check_keys',
+    'check_wifs', 'CHECK_CHUNK_BATCHES', 'check_keys_parallel',
+    'KEY_RING_RECORDS', 'KEY_RING_SPINS', 'KEY_RING_POLL', 'KeyRing',
+    'check_keys_shared', 'CHECKPOINT_SECONDS', 'Checkpoint',
+    'add_checkpoint_arguments', 'open_checkpoint', 'BIP32_HARDENED',
+    'compressed_public_key', 'parse_bip32_path', 'bip32_master_key',
+    'bip32_child_key', 'bip32_derive', 'mnemonic_to_seed', 'BIP32_TEMPLATES',
+    'parse_bip32_template', 'Bip32Tree', 'bip32_sweep', 'BSGS_ENTRY_BYTES',
+    'BSGS_MEMORY', 'BSGS_CHUNK', 'KANGAROO_HERD', 'KANGAROO_ROUND_STEPS',
+    'KANGAROO_GIVE_UP', 'decode_public_key', 'consecutive_multiples',
+    'walk_progression', 'bsgs_solve', 'kangaroo_jumps', 'kangaroo_walk',
+    'kangaroo_solve', 'AFFINE_TRANSFORMS', 'KEY_TRANSFORMS',
+    'offset_transform', 'shift_transform', 'affine_transform_point',
+    'transformed_hash160s',
+]
+
+# RIPEMD-160 message word order (r) and rotation amounts (s) for the left
+# and right (primed) lines
+_RMD_R = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+          7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+          3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+          1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+          4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13]
+
+_RMD_RP = [5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+           6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+           15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+           8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+           12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11]
+
+_RMD_S = [11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+          7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+          11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+          11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+          9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6]
+
+_RMD_SP = [8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+           9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+           9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+           15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+           8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11]
+
+# Pure Python RIPEMD-160 implementation
+def ripemd160(message):
+    """Pure Python RIPEMD-160 implementation."""
+    # Try hashlib first
+    try:
+        h = hashlib.new('ripemd160')
+        h.update(message)
+        return h.digest()
+    except ValueError:
+        pass
+    
+    if len(message) == 32:
+        return ripemd160_32_pure(message)
+    
+    # Pure Python fallback
+    def f(j, x, y, z):
+        if j < 16:
+            return x ^ y ^ z
+        elif j < 32:
+            return (x & y) | (~x & z)
+        elif j < 48:
+            return (x | ~y) ^ z
+        elif j < 64:
+            return (x & z) | (y & ~z)
+        else:
+            return x ^ (y | ~z)
+    
+    def K(j):
+        if j < 16:
+            return 0x00000000
+        elif j < 32:
+            return 0x5A827999
+        elif j < 48:
+            return 0x6ED9EBA1
+        elif j < 64:
+            return 0x8F1BBCDC
+        else:
+            return 0xA953FD4E
+    
+    def Kp(j):
+        if j < 16:
+            return 0x50A28BE6
+        elif j < 32:
+            return 0x5C4DD124
+        elif j < 48:
+            return 0x6D703EF3
+        elif j < 64:
+            return 0x7A6D76E9
+        else:
+            return 0x00000000
+    
+    def rol(x, n):
+        return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+    
+    r, rp, s, sp = _RMD_R, _RMD_RP, _RMD_S, _RMD_SP
+    
+    # Padding
+    msg = bytearray(message)
+    msg_len = len(message)
+    msg.append(0x80)
+    while len(msg) % 64 != 56:
+        msg.append(0x00)
+    msg += struct.pack('<Q', msg_len * 8)
+    
+    # Initial hash values
+    h0 = 0x67452301
+    h1 = 0xEFCDAB89
+    h2 = 0x98BADCFE
+    h3 = 0x10325476
+    h4 = 0xC3D2E1F0
+    
+    # Process each 64-byte block
+    for i in range(0, len(msg), 64):
+        block = msg[i:i+64]
+        X = struct.unpack('<16I', block)
+        
+        A, B, C, D, E = h0, h1, h2, h3, h4
+        Ap, Bp, Cp, Dp, Ep = h0, h1, h2, h3, h4
+        
+        for j in range(80):
+            T = (A + f(j, B, C, D) + X[r[j]] + K(j)) & 0xFFFFFFFF
+            T = (rol(T, s[j]) + E) & 0xFFFFFFFF
+            A = E
+            E = D
+            D = rol(C, 10)
+            C = B
+            B = T
+            
+            T = (Ap + f(79-j, Bp, Cp, Dp) + X[rp[j]] + Kp(j)) & 0xFFFFFFFF
+            T = (rol(T, sp[j]) + Ep) & 0xFFFFFFFF
+            Ap = Ep
+            Ep = Dp
+            Dp = rol(Cp, 10)
+            Cp = Bp
+            Bp = T
+        
+        T = (h1 + C + Dp) & 0xFFFFFFFF
+        h1 = (h2 + D + Ep) & 0xFFFFFFFF
+        h2 = (h3 + E + Ap) & 0xFFFFFFFF
+        h3 = (h4 + A + Bp) & 0xFFFFFFFF
+        h4 = (h0 + B + Cp) & 0xFFFFFFFF
+        h0 = T
+    
+    return struct.pack('<5I', h0, h1, h2, h3, h4)
+
+# Single-block RIPEMD-160 for 32-byte messages (the SHA-256 digest inside
+# hash160).  The padding is constant: word 8 is 0x80, word 14 is the bit
+# length 256 and the rest are zero, so it folds into the round constants.
+# The 2 x 80 steps are generated as straight-line code with the round
+# functions, constants and rotations inlined and the five working
+# variables renamed instead of shuffled.
+_RMD_K = (0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+_RMD_KP = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000)
+_RMD_F = ('{x} ^ {y} ^ {z}',
+          '({x} & {y}) | (~{x} & {z})',
+          '({x} | ~{y}) ^ {z}',
+          '({x} & {z}) | ({y} & ~{z})',
+          '{x} ^ ({y} | ~{z})')
+_RMD_PAD = {8: 0x80, 14: 256}
+
+def _ripemd160_32_source():
+    lines = ['def ripemd160_32_kernel(message):',
+             '    X0, X1, X2, X3, X4, X5, X6, X7 = _unpack_8I(message)']
+    for line, order, rotations, constants in (('', _RMD_R, _RMD_S, _RMD_K),
+                                              ('p', _RMD_RP, _RMD_SP, _RMD_KP)):
+        v = [name + line for name in 'abcde']
+        lines.append(f'    {", ".join(v)} = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0')
+        for j in range(80):
+            a, b, c, d, e = v
+            rnd = j // 16 if not line else 4 - j // 16
+            f = _RMD_F[rnd].format(x=b, y=c, z=d)
+            word = order[j]
+            k = constants[j // 16] + _RMD_PAD.get(word, 0)
+            terms = [a, f'({f})'] + ([f'X{word}'] if word < 8 else []) + ([f'{k:#x}'] if k else [])
+            rot = rotations[j]
+            lines.append(f'    t = ({" + ".join(terms)}) & 0xFFFFFFFF')
+            lines.append(f'    {a} = (((t << {rot}) | (t >> {32 - rot})) + {e}) & 0xFFFFFFFF')
+            lines.append(f'    {c} = (({c} << 10) | ({c} >> 22)) & 0xFFFFFFFF')
+            v = [e, a, b, c, d]
+        lines.append(f'    A{line}, B{line}, C{line}, D{line}, E{line} = {", ".join(v)}')
+    lines.append('    return _pack_5I((0xEFCDAB89 + C + Dp) & 0xFFFFFFFF,')
+    lines.append('                    (0x98BADCFE + D + Ep) & 0xFFFFFFFF,')
+    lines.append('                    (0x10325476 + E + Ap) & 0xFFFFFFFF,')
+    lines.append('                    (0xC3D2E1F0 + A + Bp) & 0xFFFFFFFF,')
+    lines.append('                    (0x67452301 + B + Cp) & 0xFFFFFFFF)')
+    return '\n'.join(lines) + '\n'
+
+_unpack_8I = struct.Struct('<8I').unpack
+_pack_5I = struct.Struct('<5I').pack
+_ripemd160_32_kernel = None
+
+def _check_ripemd160_kernel(name, kernel):
+    """Raise RuntimeError unless kernel (many 32-byte messages -> digests)
+    gives the hash160s of the compressed and uncompressed G."""
+    x, y = SECP256K1_GX.to_bytes(32, 'big'), SECP256K1_GY.to_bytes(32, 'big')
+    vectors = [(b'\x02' + x, '751e76e8199196d454941c45d1b3a323f1433bd6'),
+               (b'\x04' + x + y, '91b24bf9f5288532960ac687abb035127b1d28a5')]
+    digests = kernel([hashlib.sha256(data).digest() for data, _ in vectors])
+    if [d.hex() for d in digests] != [expected for _, expected in vectors]:
+        raise RuntimeError(f'{name} does not match the RIPEMD-160 test vectors')
+
+def ripemd160_32_pure(message):
+    """RIPEMD-160 of a 32-byte message (unrolled single block).
+
+    The kernel is generated and compiled on first use: hashlib usually has
+    RIPEMD-160, and compiling it at import would slow every start.  It is
+    checked against the test vectors before it is used.
+    """
+    global _ripemd160_32_kernel
+    if _ripemd160_32_kernel is None:
+        namespace = {'_unpack_8I': _unpack_8I, '_pack_5I': _pack_5I}
+        exec(_ripemd160_32_source(), namespace)
+        kernel = namespace['ripemd160_32_kernel']
+        _check_ripemd160_kernel('ripemd160_32_pure', lambda messages: list(map(kernel, messages)))
+        _ripemd160_32_kernel = kernel
+    return _ripemd160_32_kernel(message)
+
+def _hashlib_ripemd160_32(message):
+    return hashlib.new('ripemd160', message).digest()
+
+# hash160 uses OpenSSL's RIPEMD-160 when hashlib has it and the unrolled
+# kernel otherwise (OpenSSL 3 moved ripemd160 to the legacy provider)
+try:
+    hashlib.new('ripemd160')
+    ripemd160_32 = _hashlib_ripemd160_32
+except ValueError:
+    ripemd160_32 = ripemd160_32_pure
+
+def hash160(data):
+    """RIPEMD-160(SHA-256(data))."""
+    return ripemd160_32(hashlib.sha256(data).digest())
+
+_ripemd160_lanes_checked = False
+
+def ripemd160_32_many(messages):
+    """RIPEMD-160 of many 32-byte messages at once, one NumPy lane per message.
+
+    Every step of the compression function is applied to all lanes with
+    uint32 vector operations, so the Python overhead is paid once per step
+    instead of once per message.  Requires NumPy.  The first call checks
+    the kernel against the test vectors.
+    """
+    global _ripemd160_lanes_checked
+    if not _ripemd160_lanes_checked:
+        _ripemd160_lanes_checked = True
+        try:
+            _check_ripemd160_kernel('ripemd160_32_many', _ripemd160_lanes)
+        except BaseException:
+            _ripemd160_lanes_checked = False
+            raise
+    return _ripemd160_lanes(messages)
+
+def _ripemd160_lanes(messages):
+    import numpy as np
+    
+    words = np.frombuffer(b''.join(messages), dtype='<u4').reshape(-1, 8)
+    count = len(words)
+    zero = np.zeros(count, dtype=np.uint32)
+    X = [np.ascontiguousarray(words[:, i]) for i in range(8)]
+    X += [zero + np.uint32(_RMD_PAD.get(i, 0)) for i in range(8, 16)]
+    
+    def rol(x, n):
+        return (x << np.uint32(n)) | (x >> np.uint32(32 - n))
+    
+    def f(rnd, x, y, z):
+        if rnd == 0:
+            return x ^ y ^ z
+        if rnd == 1:
+            return (x & y) | (~x & z)
+        if rnd == 2:
+            return (x | ~y) ^ z
+        if rnd == 3:
+            return (x & z) | (y & ~z)
+        return x ^ (y | ~z)
+    
+    initial = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+    lines = []
+    for order, rotations, constants, right in ((_RMD_R, _RMD_S, _RMD_K, False),
+                                               (_RMD_RP, _RMD_SP, _RMD_KP, True)):
+        A, B, C, D, E = (zero + np.uint32(h) for h in initial)
+        for j in range(80):
+            rnd = 4 - j // 16 if right else j // 16
+            T = A + f(rnd, B, C, D) + X[order[j]] + np.uint32(constants[j // 16])
+            T = rol(T, rotations[j]) + E
+            A, E, D, C, B = E, D, rol(C, 10), B, T
+        lines.append((A, B, C, D, E))
+    
+    (A, B, C, D, E), (Ap, Bp, Cp, Dp, Ep) = lines
+    h = np.stack([np.uint32(initial[1]) + C + Dp,
+                  np.uint32(initial[2]) + D + Ep,
+                  np.uint32(initial[3]) + E + Ap,
+                  np.uint32(initial[4]) + A + Bp,
+                  np.uint32(initial[0]) + B + Cp], axis=1).astype('<u4').tobytes()
+    return [h[i:i + 20] for i in range(0, 20 * count, 20)]
+
+# Below this many messages the per-step NumPy overhead outweighs the lanes
+RIPEMD160_LANES_MIN = 64
+
+def hash160_many(datas):
+    """hash160 of many messages: hashlib if possible, else NumPy lanes."""
+    digests = [hashlib.sha256(data).digest() for data in datas]
+    if ripemd160_32 is _hashlib_ripemd160_32 or len(digests) < RIPEMD160_LANES_MIN:
+        return [ripemd160_32(d) for d in digests]
+    try:
+        return ripemd160_32_many(digests)
+    except ImportError:
+        return [ripemd160_32(d) for d in digests]
+
+def base58_encode(data):
+    """Base58 encode bytes."""
+    alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+    
+    leading_zeros = 0
+    for byte in data:
+        if byte == 0:
+            leading_zeros += 1
+        else:
+            break
+    
+    num = int.from_bytes(data, 'big')
+    result = ''
+    while num > 0:
+        num, rem = divmod(num, 58)
+        result = alphabet[rem] + result
+    
+    return '1' * leading_zeros + result
+
+def base58_decode(s):
+    """Base58 decode a string to bytes."""
+    alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+    
+    num = 0
+    for c in s:
+        num = num * 58 + alphabet.index(c)
+    
+    leading_zeros = len(s) - len(s.lstrip('1'))
+    body = num.to_bytes((num.bit_length() + 7) // 8, 'big')
+    return b'\x00' * leading_zeros + body
+
+def address_to_hash160(address):
+    """Decode a P2PKH address to its 20-byte hash160, verifying the checksum."""
+    data = base58_decode(address)
+    payload, checksum = data[:-4], data[-4:]
+    if len(payload) != 21 or hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError(f'Invalid address: {address}')
+    return payload[1:]
+
+def hash160_to_address(hash160, version=b'\x00'):
+    """Base58check encode a hash160 as a P2PKH address."""
+    versioned = version + hash160
+    checksum = hashlib.sha256(hashlib.sha256(versioned).digest()).digest()[:4]
+    return base58_encode(versioned + checksum)
+
+# WIF private keys: base58check of 0x80 || key, with a 0x01 suffix when
+# the key's public point is used compressed; 51 or 52 characters.  Most
+# strings from candidate sources are not WIF, so the decoder only handles
+# a known payload size and rejects a string on its length and first
+# character (fixed by the version byte), its alphabet, version byte,
+# suffix and double-SHA256 checksum before the key is used.
+WIF_VERSION = 0x80
+# Length -> (compressed, possible first characters under version 0x80)
+_WIF_SHAPES = {51: (False, '5'), 52: (True, 'KL')}
+WIF_FORMATS = {False: ('uncompressed',), True: ('compressed', 'p2sh-p2wpkh', 'p2wpkh', 'p2tr')}
+
+# Byte -> base58 digit translation table; 0xff marks bytes outside the alphabet
+_BASE58_DIGITS = bytes('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'.find(chr(c)) & 0xff
+                       for c in range(256))
+
+def base58check_decode_fixed(s, size):
+    """Decode a base58check string with a payload of exactly size bytes.
+
+    Returns the payload, or None if s has a character outside the
+    alphabet, does not decode to size + 4 bytes or fails the checksum.
+    """
+    try:
+        digits = s.encode('ascii').translate(_BASE58_DIGITS)
+    except UnicodeEncodeError:
+        return None
+    if b'\xff' in digits:
+        return None
+    num = 0
+    for d in digits:
+        num = num * 58 + d
+    try:
+        data = num.to_bytes(size + 4, 'big')
+    except OverflowError:
+        return None
+    # Each leading '1' stands for one leading zero byte, no more and no less
+    if len(data) - len(data.lstrip(b'\x00')) != len(s) - len(s.lstrip('1')):
+        return None
+    payload = data[:size]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != data[size:]:
+        return None
+    return payload
+
+def _wif_decode(s):
+    shape = _WIF_SHAPES.get(len(s))
+    if shape is None or s[0] not in shape[1]:
+        return None
+    compressed = shape[0]
+    payload = base58check_decode_fixed(s, 34 if compressed else 33)
+    if payload is None or payload[0] != WIF_VERSION or (compressed and payload[33] != 1):
+        return None
+    key = int.from_bytes(payload[1:33], 'big')
+    if not 0 < key < SECP256K1_N:
+        return None
+    return key, compressed
+
+def wif_decode(s):
+    """Decode a mainnet WIF private key to (key, compressed)."""
+    decoded = _wif_decode(s)
+    if decoded is None:
+        raise ValueError(f'Invalid WIF: {s}')
+    return decoded
+
+def wif_encode(key, compressed=True):
+    """Encode a private key (int) as a mainnet WIF string."""
+    payload = bytes([WIF_VERSION]) + key.to_bytes(32, 'big') + (b'\x01' if compressed else b'')
+    checksum = hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    return base58_encode(payload + checksum)
+
+# secp256k1 parameters
+SECP256K1_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+SECP256K1_GX = 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798
+SECP256K1_GY = 0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8
+SECP256K1_G = (SECP256K1_GX, SECP256K1_GY)
+
+def point_add(p1, p2, p):
+    """Add two points on secp256k1 curve."""
+    if p1 is None:
+        return p2
+    if p2 is None:
+        return p1
+    
+    x1, y1 = p1
+    x2, y2 = p2
+    
+    if x1 == x2 and y1 != y2:
+        return None
+    
+    if x1 == x2:
+        m = (3 * x1 * x1) * pow(2 * y1, -1, p) % p
+    else:
+        m = (y2 - y1) * pow(x2 - x1, -1, p) % p
+    
+    x3 = (m * m - x1 - x2) % p
+    y3 = (m * (x1 - x3) - y1) % p
+    
+    return (x3, y3)
+
+# Jacobian coordinates: (X, Y, Z) represents the affine point (X/Z^2, Y/Z^3).
+# None is the point at infinity, as in the affine functions above.
+
+def to_jacobian(point):
+    """Lift an affine point to Jacobian coordinates."""
+    if point is None:
+        return None
+    return (point[0], point[1], 1)
+
+def from_jacobian(point, p):
+    """Convert a Jacobian point back to affine (one modular inversion)."""
+    if point is None:
+        return None
+    X, Y, Z = point
+    z_inv = pow(Z, -1, p)
+    z_inv2 = z_inv * z_inv % p
+    return (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+
+def jacobian_double(pt, p):
+    """Double a Jacobian point (secp256k1 has a = 0)."""
+    if pt is None:
+        return None
+    X1, Y1, Z1 = pt
+    if Y1 == 0:
+        return None
+    A = X1 * X1 % p
+    B = Y1 * Y1 % p
+    C = B * B % p
+    D = 2 * ((X1 + B) * (X1 + B) - A - C) % p
+    E = 3 * A % p
+    X3 = (E * E - 2 * D) % p
+    Y3 = (E * (D - X3) - 8 * C) % p
+    Z3 = 2 * Y1 * Z1 % p
+    return (X3, Y3, Z3)
+
+def jacobian_add(p1, p2, p):
+    """Add two Jacobian points."""
+    if p1 is None:
+        return p2
+    if p2 is None:
+        return p1
+    X1, Y1, Z1 = p1
+    X2, Y2, Z2 = p2
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    R = (S2 - S1) % p
+    if H == 0:
+        if R == 0:
+            return jacobian_double(p1, p)
+        return None
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - S1 * HHH) % p
+    Z3 = Z1 * Z2 * H % p
+    return (X3, Y3, Z3)
+
+def jacobian_add_affine(p1, p2, p):
+    """Add an affine point to a Jacobian point (mixed addition, Z2 = 1)."""
+    if p2 is None:
+        return p1
+    if p1 is None:
+        return to_jacobian(p2)
+    X1, Y1, Z1 = p1
+    x2, y2 = p2
+    Z1Z1 = Z1 * Z1 % p
+    U2 = x2 * Z1Z1 % p
+    S2 = y2 * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    R = (S2 - Y1) % p
+    if H == 0:
+        if R == 0:
+            return jacobian_double(p1, p)
+        return None
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return (X3, Y3, Z3)
+
+def scalar_mult(k, point, p):
+    """Multiply point by scalar on secp256k1.
+
+    Runs left-to-right double-and-add in Jacobian coordinates with mixed
+    additions of the affine base point, so the whole multiplication costs a
+    single modular inversion (in the final conversion back to affine).
+    """
+    if k == 0 or point is None:
+        return None
+    if k < 0:
+        k = -k
+        point = (point[0], -point[1] % p)
+    
+    result = None
+    for bit in bin(k)[2:]:
+        result = jacobian_double(result, p)
+        if bit == '1':
+            result = jacobian_add_affine(result, point, p)
+    
+    return from_jacobian(result, p)
+
+# GLV endomorphism: (x, y) -> (beta * x, y) is multiplication by lambda.
+SECP256K1_LAMBDA = 0x5363AD4CC05C30E0A5261C028812645A122E22EA20816678DF02967C1B23BD72
+SECP256K1_BETA = 0x7AE96A2B657C07106E64479EAC3434E99CF0497512F58995C1396C28719501EE
+
+# Short basis of the lattice {(a, b) : a + b * lambda = 0 mod n}
+_GLV_A1 = 0x3086D221A7D46BCDE86C90E49284EB15
+_GLV_B1 = -0xE4437ED6010E88286F547FA90ABFE4C3
+_GLV_A2 = 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+_GLV_B2 = _GLV_A1
+
+def wnaf(k, w):
+    """Width-w non-adjacent form of k >= 0, least significant digit first."""
+    digits = []
+    half = 1 << (w - 1)
+    full = 1 << w
+    while k:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+def glv_split(k):
+    """Split k into (k1, k2) of about 128 bits with k = k1 + k2 * lambda mod n."""
+    n = SECP256K1_N
+    c1 = (_GLV_B2 * k + n // 2) // n
+    c2 = (-_GLV_B1 * k + n // 2) // n
+    k1 = k - c1 * _GLV_A1 - c2 * _GLV_A2
+    k2 = -c1 * _GLV_B1 - c2 * _GLV_B2
+    return k1, k2
+
+def _odd_multiples(point, count, p):
+    """Return [P, 3P, 5P, ...] (count points, affine)."""
+    double = jacobian_double(to_jacobian(point), p)
+    multiples = [to_jacobian(point)]
+    for _ in range(count - 1):
+        multiples.append(jacobian_add(multiples[-1], double, p))
+    return batch_from_jacobian(multiples, p)
+
+def scalar_mult_wnaf(k, point, p, w=5):
+    """Multiply an arbitrary point by k using a width-w NAF.
+
+    Only odd multiples up to (2^(w-1) - 1) * P are precomputed; on average
+    one addition is needed per w + 1 doublings.
+    """
+    if point is None:
+        return None
+    k %= SECP256K1_N
+    if k == 0:
+        return None
+    
+    table = _odd_multiples(point, 1 << (w - 2), p)
+    result = None
+    for d in reversed(wnaf(k, w)):
+        result = jacobian_double(result, p)
+        if d > 0:
+            result = jacobian_add_affine(result, table[d >> 1], p)
+        elif d < 0:
+            x, y = table[-d >> 1]
+            result = jacobian_add_affine(result, (x, p - y), p)
+    
+    return from_jacobian(result, p)
+
+def scalar_mult_glv(k, point, p, w=5):
+    """Multiply an arbitrary point by k using the GLV endomorphism and wNAF.
+
+    k is split into two half-length scalars, k = k1 + k2 * lambda, and
+    k1 * P + k2 * (lambda * P) is evaluated in one interleaved pass, which
+    halves the number of doublings.  The table for lambda * P is obtained
+    from the table for P by multiplying each x by beta.
+    """
+    if point is None:
+        return None
+    k %= SECP256K1_N
+    if k == 0:
+        return None
+    
+    k1, k2 = glv_split(k)
+    table1 = _odd_multiples(point, 1 << (w - 2), p)
+    table2 = [(SECP256K1_BETA * x % p, y) for x, y in table1]
+    
+    # Fold the signs of k1 and k2 into the tables
+    if k1 < 0:
+        k1 = -k1
+        table1 = [(x, p - y) for x, y in table1]
+    if k2 < 0:
+        k2 = -k2
+        table2 = [(x, p - y) for x, y in table2]
+    
+    naf1 = wnaf(k1, w)
+    naf2 = wnaf(k2, w)
+    length = max(len(naf1), len(naf2))
+    naf1 += [0] * (length - len(naf1))
+    naf2 += [0] * (length - len(naf2))
+    
+    result = None
+    for i in range(length - 1, -1, -1):
+        result = jacobian_double(result, p)
+        for d, table in ((naf1[i], table1), (naf2[i], table2)):
+            if d > 0:
+                result = jacobian_add_affine(result, table[d >> 1], p)
+            elif d < 0:
+                x, y = table[-d >> 1]
+                result = jacobian_add_affine(result, (x, p - y), p)
+    
+    return from_jacobian(result, p)
+
+def batch_from_jacobian(points, p):
+    """Convert many Jacobian points to affine with one shared inversion.
+
+    Uses Montgomery's trick: the Z coordinates are multiplied into running
+    prefix products, the final product is inverted once and the individual
+    inverses are peeled back off in reverse order.  Points at infinity are
+    passed through as None.
+    """
+    prefix = []
+    acc = 1
+    for pt in points:
+        if pt is not None:
+            acc = acc * pt[2] % p
+        prefix.append(acc)
+    
+    inv = pow(acc, -1, p) if prefix else 1
+    result = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        pt = points[i]
+        if pt is None:
+            continue
+        X, Y, Z = pt
+        z_inv = inv * prefix[i - 1] % p if i else inv
+        inv = inv * Z % p
+        z_inv2 = z_inv * z_inv % p
+        result[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+    
+    return result
+
+def batch_inverse(values, p):
+    """Invert many nonzero field elements with a single modular inversion."""
+    prefix = []
+    acc = 1
+    for v in values:
+        acc = acc * v % p
+        prefix.append(acc)
+    
+    inv = pow(acc, -1, p)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % p
+        inv = inv * values[i] % p
+    if values:
+        result[0] = inv
+    return result
+
+def batch_add_affine(base, points, p):
+    """Return [base + Q for Q in points] in affine form, sharing one inversion.
+
+    This is the inner kernel of the sequential scanners: every result costs
+    one slope computation plus three multiplications of Montgomery's trick.
+    The rare doubling or cancelling pairs fall back to point_add.
+    """
+    bx, by = base
+    denominators = [(q[0] - bx) % p or 1 for q in points]
+    inverses = batch_inverse(denominators, p)
+    
+    result = []
+    for (qx, qy), inv in zip(points, inverses):
+        if qx == bx:
+            result.append(point_add(base, (qx, qy), p))
+            continue
+        m = (qy - by) * inv % p
+        x3 = (m * m - bx - qx) % p
+        result.append((x3, (m * (bx - x3) - by) % p))
+    return result
+
+# Fixed-base table for G: entry (i, j) holds j * 2^(8i) * G for j = 1..255, so
+# k * G is a sum of at most 32 table points and needs no doublings at all.
+# The table is written to disk once and mmap'd read-only afterwards, so
+# loading takes milliseconds and every process on the machine (forked workers
+# included) shares the same physical pages.
+G_TABLE_PATH = os.environ.get('NESRD3Q_G_TABLE', 'secp256k1_g_table.bin')
+G_TABLE_WINDOW = 8
+G_TABLE_WINDOWS = 256 // G_TABLE_WINDOW
+G_TABLE_ENTRIES = (1 << G_TABLE_WINDOW) - 1
+G_TABLE_SIZE = G_TABLE_WINDOWS * G_TABLE_ENTRIES * 64
+
+_g_table = None
+
+def build_g_table():
+    """Compute the fixed-base table for G and return it as raw bytes."""
+    p = SECP256K1_P
+    out = bytearray()
+    base = SECP256K1_G
+    for _ in range(G_TABLE_WINDOWS):
+        multiples = []
+        acc = None
+        for _ in range(G_TABLE_ENTRIES):
+            acc = jacobian_add_affine(acc, base, p)
+            multiples.append(acc)
+        for x, y in batch_from_jacobian(multiples, p):
+            out += x.to_bytes(32, 'big') + y.to_bytes(32, 'big')
+        
+        nxt = to_jacobian(base)
+        for _ in range(G_TABLE_WINDOW):
+            nxt = jacobian_double(nxt, p)
+        base = from_jacobian(nxt, p)
+    
+    return bytes(out)
+
+def load_g_table(path=None):
+    """Load (building and saving on first use) the fixed-base table for G.
+
+    Call this in the parent before forking worker processes so they inherit
+    the mapping instead of each opening the file again.
+    """
+    global _g_table
+    if _g_table is not None:
+        return _g_table
+    
+    path = path or G_TABLE_PATH
+    try:
+        with open(path, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        table = None
+    
+    expected = SECP256K1_GX.to_bytes(32, 'big') + SECP256K1_GY.to_bytes(32, 'big')
+    if table is None or len(table) != G_TABLE_SIZE or table[:64] != expected:
+        table = build_g_table()
+        try:
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(table)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # read-only location: keep the in-memory copy
+    
+    _g_table = table
+    return table
+
+def fixed_base_mult_jacobian(k):
+    """Compute k * G in Jacobian coordinates using only table additions."""
+    p = SECP256K1_P
+    table = _g_table if _g_table is not None else load_g_table()
+    k %= SECP256K1_N
+    result = None
+    offset = 0
+    while k:
+        j = k & G_TABLE_ENTRIES
+        if j:
+            pos = offset + (j - 1) * 64
+            point = (int.from_bytes(table[pos:pos + 32], 'big'),
+                     int.from_bytes(table[pos + 32:pos + 64], 'big'))
+            result = jacobian_add_affine(result, point, p)
+        k >>= G_TABLE_WINDOW
+        offset += G_TABLE_ENTRIES * 64
+    
+    return result
+
+def fixed_base_mult(k):
+    """Compute k * G (affine) from the fixed-base table."""
+    return from_jacobian(fixed_base_mult_jacobian(k), SECP256K1_P)
+
+# EC backends.  Computing k * G dominates the cost of a candidate.  The
+# pure-Python table code above always works; the ecdsa package and
+# coincurve (libsecp256k1 bindings) are used when importable.  A backend
+# maps a batch of scalars (already reduced mod n) to affine points, None
+# for 0, so hashing, formats and siblings stay shared.  The first batch
+# probes the importable backends once and keeps the fastest.
+def _pure_ec_points(scalars):
+    return batch_from_jacobian([fixed_base_mult_jacobian(k) for k in scalars], SECP256K1_P)
+
+def _ecdsa_ec_points(scalars):
+    import ecdsa
+    generator = ecdsa.SECP256k1.generator
+    points = []
+    for k in scalars:
+        if k:
+            point = (generator * k).to_affine()
+            points.append((point.x(), point.y()))
+        else:
+            points.append(None)
+    return points
+
+def _coincurve_ec_points(scalars):
+    import coincurve
+    points = []
+    for k in scalars:
+        if k:
+            data = coincurve.PublicKey.from_valid_secret(k.to_bytes(32, 'big')).format(compressed=False)
+            points.append((int.from_bytes(data[1:33], 'big'), int.from_bytes(data[33:], 'big')))
+        else:
+            points.append(None)
+    return points
+
+EC_BACKENDS = {
+    'pure': (None, _pure_ec_points),
+    'ecdsa': ('ecdsa', _ecdsa_ec_points),
+    'coincurve': ('coincurve', _coincurve_ec_points),
+}
+EC_BACKEND_PROBE_KEYS = 32
+_ec_backend = None
+
+def available_ec_backends():
+    """Names of the backends whose module can be imported."""
+    names = []
+    for name, (module, _) in EC_BACKENDS.items():
+        if module is not None:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+        names.append(name)
+    return names
+
+def time_ec_backend(name, scalars):
+    """Return (seconds per key, points) of one backend on scalars."""
+    points_fn = EC_BACKENDS[name][1]
+    if name == 'pure':
+        load_g_table()  # the table build is not part of the per-key cost
+    start = time.perf_counter()
+    points = points_fn(scalars)
+    return (time.perf_counter() - start) / len(scalars), points
+
+def select_ec_backend(name=None):
+    """Set or return the EC backend name.
+
+    Without a name, $NESRD3Q_EC_BACKEND is honoured; otherwise every
+    importable backend is timed once on a few keys, checked against the
+    pure code, and the fastest one is kept for this process.
+    """
+    global _ec_backend
+    if name is None and _ec_backend is None:
+        name = os.environ.get('NESRD3Q_EC_BACKEND')
+    if name:
+        if name not in EC_BACKENDS:
+            raise ValueError(f'Unknown EC backend: {name}')
+        if name not in available_ec_backends():
+            raise ValueError(f'EC backend not installed: {name}')
+        _ec_backend = name
+    elif _ec_backend is None:
+        scalars = [int.from_bytes(hashlib.sha256(bytes([i])).digest(), 'big') % SECP256K1_N
+                   for i in range(EC_BACKEND_PROBE_KEYS)]
+        timings = {}
+        reference = None
+        for candidate in available_ec_backends():
+            per_key, points = time_ec_backend(candidate, scalars)
+            reference = reference or points
+            if points == reference:
+                timings[candidate] = per_key
+        _ec_backend = min(timings, key=timings.get)
+    return _ec_backend
+
+def ec_points(scalars):
+    """Affine k * G for every scalar (reduced mod n; None for 0) via the selected backend."""
+    return EC_BACKENDS[select_ec_backend()][1]([k % SECP256K1_N for k in scalars])
+
+# Address formats.  All of them are derived from the one public point:
+# P2PKH hashes either serialization, P2WPKH is the compressed hash160 as a
+# version 0 witness program and P2SH-P2WPKH hashes that program's script.
+# Only P2TR needs more EC work, the BIP341 tweak Q = P + t * G (one
+# fixed-base multiplication), so it is worth masking out when unused.
+# Targets are decoded into the hash or program space of their type once.
+ADDRESS_FORMATS = ('uncompressed', 'compressed', 'p2sh-p2wpkh', 'p2wpkh', 'p2tr')
+P2PKH_FORMATS = ('uncompressed', 'compressed')
+FORMAT_SPACES = {
+    'uncompressed': 'p2pkh',
+    'compressed': 'p2pkh',
+    'p2sh-p2wpkh': 'p2sh',
+    'p2wpkh': 'p2wpkh',
+    'p2tr': 'p2tr',
+}
+
+BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+BECH32M_CONST = 0x2bc830a3
+
+def bech32_polymod(values):
+    """BIP173 checksum polynomial."""
+    generator = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+    chk = 1
+    for v in values:
+        top = chk >> 25
+        chk = (chk & 0x1ffffff) << 5 ^ v
+        for i in range(5):
+            if (top >> i) & 1:
+                chk ^= generator[i]
+    return chk
+
+def _bech32_hrp_expand(hrp):
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+def _convert_bits(data, from_bits, to_bits, pad=True):
+    """Regroup a sequence of from_bits-bit values into to_bits-bit values."""
+    acc = 0
+    bits = 0
+    result = []
+    maxv = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((acc >> bits) & maxv)
+    if pad and bits:
+        result.append((acc << (to_bits - bits)) & maxv)
+    elif not pad and (bits >= from_bits or (acc << (to_bits - bits)) & maxv):
+        return None
+    return result
+
+def segwit_encode(witver, program, hrp='bc'):
+    """Encode a witness program as a bech32 (v0) or bech32m (v1+) address."""
+    data = [witver] + _convert_bits(program, 8, 5)
+    const = 1 if witver == 0 else BECH32M_CONST
+    polymod = bech32_polymod(_bech32_hrp_expand(hrp) + data + [0] * 6) ^ const
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + '1' + ''.join(BECH32_CHARSET[d] for d in data + checksum)
+
+def segwit_decode(address, hrp='bc'):
+    """Decode a segwit address to (witness version, program)."""
+    addr = address.lower()
+    pos = addr.rfind('1')
+    if address != addr and address != address.upper() or addr[:pos] != hrp or len(addr) > 90:
+        raise ValueError(f'Invalid address: {address}')
+    try:
+        data = [BECH32_CHARSET.index(c) for c in addr[pos + 1:]]
+    except ValueError:
+        raise ValueError(f'Invalid address: {address}') from None
+    if len(data) < 7:
+        raise ValueError(f'Invalid address: {address}')
+    witver = data[0]
+    const = 1 if witver == 0 else BECH32M_CONST
+    program = _convert_bits(data[1:-6], 5, 8, False)
+    if (bech32_polymod(_bech32_hrp_expand(hrp) + data) != const or program is None
+            or witver > 16 or not 2 <= len(program) <= 40
+            or witver == 0 and len(program) not in (20, 32)):
+        raise ValueError(f'Invalid address: {address}')
+    return witver, bytes(program)
+
+def decode_address(address):
+    """Decode any supported address to (space, program).
+
+    space is 'p2pkh', 'p2sh', 'p2wpkh' or 'p2tr'; program is the hash160,
+    script hash or witness program the address commits to.
+    """
+    if address[:3].lower() == 'bc1':
+        witver, program = segwit_decode(address)
+        if witver == 0 and len(program) == 20:
+            return 'p2wpkh', program
+        if witver == 1 and len(program) == 32:
+            return 'p2tr', program
+        raise ValueError(f'Unsupported address: {address}')
+    
+    data = base58_decode(address)
+    payload, checksum = data[:-4], data[-4:]
+    if len(payload) != 21 or hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError(f'Invalid address: {address}')
+    if payload[0] == 0x00:
+        return 'p2pkh', payload[1:]
+    if payload[0] == 0x05:
+        return 'p2sh', payload[1:]
+    raise ValueError(f'Unsupported address: {address}')
+
+def program_to_address(fmt, program):
+    """Encode the program of an address format (see point_to_programs)."""
+    space = FORMAT_SPACES[fmt]
+    if space == 'p2pkh':
+        return hash160_to_address(program)
+    if space == 'p2sh':
+        return hash160_to_address(program, b'\x05')
+    return segwit_encode(0 if space == 'p2wpkh' else 1, program)
+
+def target_programs(addresses):
+    """Decode target addresses into {space: set of programs}.
+
+    addresses may also be a TargetIndex, whose per-space views are used.
+    """
+    if isinstance(addresses, TargetIndex):
+        return addresses.programs()
+    wanted = {}
+    for address in addresses:
+        space, program = decode_address(address)
+        wanted.setdefault(space, set()).add(program)
+    return wanted
+
+def enabled_formats(wanted, formats=None):
+    """The formats (default: all) whose space has a target in wanted."""
+    formats = ADDRESS_FORMATS if formats is None else formats
+    for fmt in formats:
+        if fmt not in FORMAT_SPACES:
+            raise ValueError(f'Unknown address format: {fmt}')
+    return tuple(fmt for fmt in formats if FORMAT_SPACES[fmt] in wanted)
+
+def tagged_hash(tag, data):
+    """BIP340 tagged hash."""
+    tag_hash = hashlib.sha256(tag.encode()).digest()
+    return hashlib.sha256(tag_hash + tag_hash + data).digest()
+
+def taproot_output_key(point):
+    """x-only BIP341 output key of the key-path-only taproot output of point."""
+    p = SECP256K1_P
+    x, y = point
+    x_bytes = x.to_bytes(32, 'big')
+    tweak = int.from_bytes(tagged_hash('TapTweak', x_bytes), 'big')
+    # The internal key is the x-only key, i.e. P with an even y
+    internal = (x, y if y % 2 == 0 else p - y)
+    q = from_jacobian(jacobian_add_affine(fixed_base_mult_jacobian(tweak), internal, p), p)
+    return q[0].to_bytes(32, 'big')
+
+def point_to_programs(point, formats=P2PKH_FORMATS):
+    """Yield (format, program) for every format in formats.
+
+    The compressed hash160 is computed once and shared by the compressed
+    P2PKH, P2WPKH and P2SH-P2WPKH formats.
+    """
+    x, y = point
+    x_bytes = x.to_bytes(32, 'big')
+    h_compressed = None
+    for fmt in formats:
+        if fmt == 'uncompressed':
+            yield fmt, hash160(b'\x04' + x_bytes + y.to_bytes(32, 'big'))
+        elif fmt == 'p2tr':
+            yield fmt, taproot_output_key(point)
+        else:
+            if h_compressed is None:
+                h_compressed = hash160((b'\x03' if y & 1 else b'\x02') + x_bytes)
+            if fmt == 'p2sh-p2wpkh':
+                yield fmt, hash160(b'\x00\x14' + h_compressed)
+            else:
+                yield fmt, h_compressed
+
+# Target index.  A sorted file of 21-byte records, the 20-byte hash160 or
+# program (P2TR: its first 20 bytes) and a bit mask of its spaces, mapped
+# read-only so that millions of targets cost no Python objects and forked
+# workers share the pages.  A Bloom filter stored behind the records
+# rejects almost every candidate after one or two bit probes; only the
+# rest is looked up by interpolation (or binary) search.
+TARGET_INDEX_MAGIC = b'NSRDIDX1'
+TARGET_INDEX_HEADER = struct.Struct('<8sQQII')   # magic, count, bloom bits, bloom k, space mask
+TARGET_INDEX_RECORD = 21
+TARGET_INDEX_BLOOM_BITS = 10   # per target: ~1% false positives with k = 7
+TARGET_INDEX_BLOOM_K = 7
+SPACE_BITS = {'p2pkh': 1, 'p2sh': 2, 'p2wpkh': 4, 'p2tr': 8}
+
+def _bloom_positions(h, bits, k):
+    """The k bit positions of a 20-byte hash in a bloom filter of the given size.
+
+    The hash is already uniformly distributed, so its own bytes serve as the
+    two base hashes of the double-hashing scheme (see might_contain).
+    """
+    h1 = int.from_bytes(h[:8], 'little')
+    h2 = int.from_bytes(h[8:16], 'little') | 1
+    return [(h1 + i * h2) % bits for i in range(k)]
+
+def read_address_list(path):
+    """Yield the addresses of a text file (one per line, '#' comments)."""
+    with open(path, 'r') as f:
+        for line in f:
+            address = line.split('#', 1)[0].strip()
+            if address:
+                yield address
+
+def build_target_index(addresses, path, skip_invalid=False):
+    """Decode addresses into a target index file; return (count, skipped).
+
+    The file is written next to path and renamed into place.
+    """
+    records = {}
+    skipped = 0
+    for address in addresses:
+        try:
+            space, program = decode_address(address)
+        except ValueError:
+            if not skip_invalid:
+                raise
+            skipped += 1
+            continue
+        key = program[:20]
+        records[key] = records.get(key, 0) | SPACE_BITS[space]
+    
+    count = len(records)
+    bits = max(64, (count * TARGET_INDEX_BLOOM_BITS + 7) // 8 * 8)
+    k = TARGET_INDEX_BLOOM_K
+    bloom = bytearray(bits // 8)
+    mask = 0
+    for key, spaces in records.items():
+        mask |= spaces
+        for pos in _bloom_positions(key, bits, k):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+    
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(TARGET_INDEX_HEADER.pack(TARGET_INDEX_MAGIC, count, bits, k, mask))
+        for key in sorted(records):
+            f.write(key + bytes((records[key],)))
+        f.write(bloom)
+    os.replace(tmp_path, path)
+    return count, skipped
+
+class TargetIndex:
+    """Read-only, memory-mapped view of a target index file."""
+    
+    def __init__(self, path, search='interpolation'):
+        if search not in ('interpolation', 'binary'):
+            raise ValueError(f'Unknown search: {search}')
+        self.path = path
+        self.search = search
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, count, bits, k, mask = TARGET_INDEX_HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = None
+        start = TARGET_INDEX_HEADER.size
+        bloom = start + count * TARGET_INDEX_RECORD if magic else 0
+        if magic != TARGET_INDEX_MAGIC or len(self._map) != bloom + bits // 8:
+            raise ValueError(f'Invalid target index: {path}')
+        self.count = count
+        self.spaces = [space for space, bit in SPACE_BITS.items() if mask & bit]
+        self._bits = bits
+        self._k = k
+        self._bloom = bloom
+    
+    def __reduce__(self):
+        # Workers reopen the file (once per process) instead of copying it
+        return open_target_index, (self.path, self.search)
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        """Yield (hash160, spaces) for every record in sorted order."""
+        m = self._map
+        for off in range(TARGET_INDEX_HEADER.size, self._bloom, TARGET_INDEX_RECORD):
+            yield m[off:off + 20], [s for s, bit in SPACE_BITS.items() if m[off + 20] & bit]
+    
+    def might_contain(self, h):
+        """Bloom filter test: False means h is certainly not a target."""
+        m = self._map
+        base = self._bloom
+        bits = self._bits
+        pos = int.from_bytes(h[:8], 'little')
+        step = int.from_bytes(h[8:16], 'little') | 1
+        for _ in range(self._k):
+            pos %= bits
+            if not m[base + (pos >> 3)] >> (pos & 7) & 1:
+                return False
+            pos += step
+        return True
+    
+    def lookup(self, h):
+        """Space bit mask of the 20-byte hash h (0 if it is not a target)."""
+        m = self._map
+        # Bloom filter first (might_contain, inlined: this is the hot path)
+        base = self._bloom
+        bits = self._bits
+        pos = int.from_bytes(h[:8], 'little')
+        step = int.from_bytes(h[8:16], 'little') | 1
+        for _ in range(self._k):
+            pos %= bits
+            if not m[base + (pos >> 3)] >> (pos & 7) & 1:
+                return 0
+            pos += step
+        
+        size = TARGET_INDEX_RECORD
+        start = TARGET_INDEX_HEADER.size
+        lo, hi = 0, self.count - 1
+        # Interpolation needs only ~log log n probes on uniform hashes; the
+        # probe budget keeps a skewed file from degrading to a linear scan
+        probes = 8 if self.search == 'interpolation' else 0
+        key = int.from_bytes(h[:8], 'big')
+        lo_key = int.from_bytes(m[start:start + 8], 'big')
+        hi_key = int.from_bytes(m[start + hi * size:start + hi * size + 8], 'big')
+        while lo <= hi:
+            if probes and lo_key < hi_key:
+                probes -= 1
+                if not lo_key <= key <= hi_key:
+                    return 0
+                mid = min(max(lo + (key - lo_key) * (hi - lo) // (hi_key - lo_key), lo), hi)
+            else:
+                mid = (lo + hi) // 2
+            off = start + mid * size
+            record = m[off:off + 20]
+            if record == h:
+                return m[off + 20]
+            if record < h:
+                lo = mid + 1
+                lo_key = int.from_bytes(record[:8], 'big')
+            else:
+                hi = mid - 1
+                hi_key = int.from_bytes(record[:8], 'big')
+        return 0
+    
+    def __contains__(self, h):
+        return self.lookup(h[:20]) != 0
+    
+    def space(self, name):
+        """Membership view of one space, usable wherever a set of programs is."""
+        return TargetIndexSpace(self, name)
+    
+    def programs(self):
+        """{space: membership view}, the target_programs() of the index."""
+        return {name: self.space(name) for name in self.spaces}
+
+class TargetIndexSpace:
+    """The targets of one address space of a TargetIndex."""
+    
+    def __init__(self, index, name):
+        self.index = index
+        self.name = name
+        self._bit = SPACE_BITS[name]
+    
+    def __reduce__(self):
+        return TargetIndexSpace, (self.index, self.name)
+    
+    def __contains__(self, program):
+        return self.index.lookup(program[:20]) & self._bit != 0
+
+_target_indexes = {}
+
+def open_target_index(path, search='interpolation'):
+    """Open a target index, reusing the mapping if this process has one."""
+    key = (path, search)
+    if key not in _target_indexes:
+        _target_indexes[key] = TargetIndex(path, search)
+    return _target_indexes[key]
+
+def private_key_to_address(private_key_hex, siblings=False, formats=P2PKH_FORMATS):
+    """Convert hex private key to Bitcoin address.
+
+    formats selects the address formats (see ADDRESS_FORMATS) derived from
+    the public point.  With siblings=True the addresses of the sibling keys n - k, lambda * k
+    and lambda^2 * k are appended too, with pk_type such as
+    'compressed:lambda'; sibling_key() recovers the matching key.
+    """
+    # Convert private key to integer
+    private_key = int(private_key_hex, 16)
+    
+    if _key_cache is not None and not siblings and set(formats) <= set(P2PKH_FORMATS):
+        for _, h_uncompressed, h_compressed in private_keys_to_hash160s([private_key]):
+            hashes = {'uncompressed': h_uncompressed, 'compressed': h_compressed}
+            return [(fmt, hash160_to_address(hashes[fmt])) for fmt in formats]
+        return [('error', 'Invalid private key')]
+    
+    # Generate public key point
+    public_point = ec_points([private_key])[0]
+    
+    if public_point is None:
+        return [('error', 'Invalid private key')]
+    
+    addresses = []
+    for suffix, point in _with_siblings(public_point, siblings):
+        for fmt, program in point_to_programs(point, formats):
+            addresses.append((fmt + suffix, program_to_address(fmt, program)))
+    
+    return addresses
+
+# Sibling keys: for P = k * G the points of n - k, lambda * k and
+# lambda^2 * k are (x, -y), (beta * x, y) and (beta^2 * x, y), so every
+# scalar multiplication yields three more candidates for one or two field
+# multiplications each.
+SIBLINGS = ('negated', 'lambda', 'lambda2')
+SECP256K1_BETA2 = SECP256K1_BETA * SECP256K1_BETA % SECP256K1_P
+
+def sibling_points(point):
+    """Return [(name, point)] for the three siblings of point."""
+    p = SECP256K1_P
+    x, y = point
+    return [('negated', (x, p - y)),
+            ('lambda', (SECP256K1_BETA * x % p, y)),
+            ('lambda2', (SECP256K1_BETA2 * x % p, y))]
+
+def sibling_key(key, name):
+    """The private key of the named sibling of key."""
+    k = private_key_to_int(key)
+    n = SECP256K1_N
+    if name == 'negated':
+        return (n - k) % n
+    if name == 'lambda':
+        return SECP256K1_LAMBDA * k % n
+    if name == 'lambda2':
+        return SECP256K1_LAMBDA * SECP256K1_LAMBDA * k % n
+    raise ValueError(f'Unknown sibling: {name}')
+
+def _with_siblings(point, siblings):
+    """Yield (pk_type suffix, point) for point and, if asked, its siblings."""
+    yield '', point
+    if siblings:
+        for name, sibling in sibling_points(point):
+            yield ':' + name, sibling
+
+def point_to_hash160s(point):
+    """Return the (uncompressed, compressed) public key hash160s of a point."""
+    x, y = point
+    x_bytes = x.to_bytes(32, 'big')
+    
+    # Uncompressed public key
+    public_key_uncompressed = b'\x04' + x_bytes + y.to_bytes(32, 'big')
+    
+    # Compressed public key
+    prefix = b'\x02' if y % 2 == 0 else b'\x03'
+    public_key_compressed = prefix + x_bytes
+    
+    return hash160(public_key_uncompressed), hash160(public_key_compressed)
+
+def points_to_hash160s(points):
+    """Batch version of point_to_hash160s (uses hash160_many)."""
+    public_keys = []
+    for x, y in points:
+        x_bytes = x.to_bytes(32, 'big')
+        public_keys.append(b'\x04' + x_bytes + y.to_bytes(32, 'big'))
+        public_keys.append((b'\x03' if y & 1 else b'\x02') + x_bytes)
+    hashes = hash160_many(public_keys)
+    return list(zip(hashes[0::2], hashes[1::2]))
+
+def private_key_to_int(key):
+    """Accept a private key as int, 32 raw bytes or a hex string."""
+    if isinstance(key, int):
+        return key
+    if isinstance(key, (bytes, bytearray)):
+        return int.from_bytes(key, 'big')
+    return int(key, 16)
+
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+def candidate_private_key(s, formats=P2PKH_FORMATS):
+    """Parse a candidate key string: 64 hex digits or a WIF.
+
+    Returns (key, formats) where formats keeps only the address formats
+    the string allows (a WIF's compression flag fixes the public key
+    serialization), or None if s is neither.
+    """
+    if len(s) == 64:
+        return (int(s, 16), tuple(formats)) if HEX_DIGITS.issuperset(s) else None
+    decoded = _wif_decode(s)
+    if decoded is None:
+        return None
+    key, compressed = decoded
+    return key, tuple(fmt for fmt in formats if fmt in WIF_FORMATS[compressed])
+
+# Key cache.  Many candidates are tested again and again by the different
+# search scripts, so key -> both hash160s is kept on disk in SQLite (WAL
+# mode: concurrent readers and writers from any number of processes) with
+# an in-process LRU in front.  The oldest entries are evicted once the
+# table exceeds its size bound.  Scripts opt in with use_key_cache().
+KEY_CACHE_PATH = os.environ.get('NESRD3Q_KEY_CACHE', 'key_cache.sqlite')
+KEY_CACHE_MAX_ENTRIES = 2_000_000
+KEY_CACHE_MEMORY_ENTRIES = 1 << 16
+_key_cache = None
+
+class KeyCache:
+    """Persistent map of 32-byte private key -> (hash160_uncompressed, hash160_compressed)."""
+    
+    def __init__(self, path=None, max_entries=KEY_CACHE_MAX_ENTRIES,
+                 memory_entries=KEY_CACHE_MEMORY_ENTRIES):
+        self.path = path or KEY_CACHE_PATH
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = collections.OrderedDict()
+        self._db = None
+        self._pid = None
+    
+    def __reduce__(self):
+        return KeyCache, (self.path, self.max_entries, self.memory_entries)
+    
+    def _connection(self):
+        # SQLite connections must not cross a fork; reconnect in each process
+        if self._pid != os.getpid():
+            import sqlite3
+            self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS hash160s ('
+                             'id INTEGER PRIMARY KEY, key BLOB UNIQUE NOT NULL, '
+                             'uncompressed BLOB NOT NULL, compressed BLOB NOT NULL)')
+            self._pid = os.getpid()
+        return self._db
+    
+    def _remember(self, key, hashes):
+        self._memory[key] = hashes
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def get_many(self, keys):
+        """Return {key: (hash160_uncompressed, hash160_compressed)} for the cached keys."""
+        found = {}
+        missing = []
+        for key in keys:
+            hashes = self._memory.get(key)
+            if hashes is None:
+                missing.append(key)
+            else:
+                self._memory.move_to_end(key)
+                found[key] = hashes
+        db = self._connection() if missing else None
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            rows = db.execute('SELECT key, uncompressed, compressed FROM hash160s WHERE key IN '
+                              f'({",".join("?" * len(chunk))})', chunk)
+            for key, h_uncompressed, h_compressed in rows:
+                found[key] = (h_uncompressed, h_compressed)
+                self._remember(key, found[key])
+        return found
+    
+    def put_many(self, items):
+        """Store (key, hash160_uncompressed, hash160_compressed) items."""
+        items = list(items)
+        if not items:
+            return
+        for key, h_uncompressed, h_compressed in items:
+            self._remember(key, (h_uncompressed, h_compressed))
+        db = self._connection()
+        with db:
+            db.execute('BEGIN IMMEDIATE')
+            db.executemany('INSERT OR IGNORE INTO hash160s (key, uncompressed, compressed) '
+                           'VALUES (?, ?, ?)', items)
+            # ids only grow, so max - min bounds the row count without a scan
+            low, high = db.execute('SELECT min(id), max(id) FROM hash160s').fetchone()
+            if high - low >= self.max_entries:
+                db.execute('DELETE FROM hash160s WHERE id <= ?', (high - self.max_entries,))
+    
+    def __len__(self):
+        return self._connection().execute('SELECT count(*) FROM hash160s').fetchone()[0]
+
+def use_key_cache(path=None, **options):
+    """Enable the key cache for the batch and single-key functions below."""
+    global _key_cache
+    _key_cache = KeyCache(path, **options)
+    return _key_cache
+
+BATCH_SIZE = 256
+
+def private_keys_to_hash160s(keys, batch_size=BATCH_SIZE):
+    """Yield (key, hash160_uncompressed, hash160_compressed) for many keys.
+
+    Keys are processed in blocks of ``batch_size``; each block shares a
+    single modular inversion for the affine conversion of its public keys.
+    Keys that are 0 mod n are skipped.  With the key cache enabled (see
+    use_key_cache) only the keys not seen before need EC work.
+    """
+    batch = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= batch_size:
+            yield from _hash160_batch(batch)
+            batch = []
+    if batch:
+        yield from _hash160_batch(batch)
+
+def _hash160_batch(batch):
+    cache = _key_cache
+    if cache is None:
+        points = list(_point_batch(batch))
+        for (key, _), hashes in zip(points, points_to_hash160s([point for _, point in points])):
+            yield (key,) + hashes
+        return
+    
+    raw = [(private_key_to_int(key) % SECP256K1_N).to_bytes(32, 'big') for key in batch]
+    known = cache.get_many(raw)
+    missing = [key for key, r in zip(batch, raw) if r not in known]
+    if missing:
+        points = list(_point_batch(missing))
+        computed = [((private_key_to_int(key) % SECP256K1_N).to_bytes(32, 'big'),) + hashes
+                    for (key, _), hashes in zip(points, points_to_hash160s([pt for _, pt in points]))]
+        cache.put_many(computed)
+        known.update((r, (hu, hc)) for r, hu, hc in computed)
+    for key, r in zip(batch, raw):
+        if r in known:
+            yield (key,) + known[r]
+
+def private_keys_to_points(keys, batch_size=BATCH_SIZE):
+    """Yield (key, affine public point) for many keys, batch_size per inversion."""
+    batch = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= batch_size:
+            yield from _point_batch(batch)
+            batch = []
+    if batch:
+        yield from _point_batch(batch)
+
+def _point_batch(batch):
+    points = ec_points([private_key_to_int(key) for key in batch])
+    for key, point in zip(batch, points):
+        if point is not None:
+            yield key, point
+
+def private_keys_to_addresses(keys, batch_size=BATCH_SIZE):
+    """Batch version of private_key_to_address: yield (key, addresses)."""
+    for key, h_uncompressed, h_compressed in private_keys_to_hash160s(keys, batch_size):
+        yield key, [('uncompressed', hash160_to_address(h_uncompressed)),
+                    ('compressed', hash160_to_address(h_compressed))]
+
+def check_keys(keys, targets, batch_size=BATCH_SIZE, siblings=False, formats=None):
+    """Yield (key, pk_type, address) for every key whose address is a target.
+
+    Matching is done on raw hash160s and witness programs; addresses are
+    only encoded for the hits that are reported.  targets may be of any
+    type decode_address() accepts.  formats restricts the address formats
+    derived per key (default: every format with a target of its type).
+    With siblings=True the three sibling keys of every candidate are
+    tested as well; a sibling hit is reported with the candidate key and a
+    pk_type such as 'compressed:lambda2', and sibling_key() gives the
+    actual private key.
+    """
+    wanted = target_programs(targets)
+    formats = enabled_formats(wanted, formats)
+    if _key_cache is not None and not siblings and set(formats) <= set(P2PKH_FORMATS):
+        # Both P2PKH hashes may come straight from the key cache
+        for key, h_uncompressed, h_compressed in private_keys_to_hash160s(keys, batch_size):
+            hashes = {'uncompressed': h_uncompressed, 'compressed': h_compressed}
+            for fmt in formats:
+                if hashes[fmt] in wanted['p2pkh']:
+                    yield key, fmt, hash160_to_address(hashes[fmt])
+        return
+    for key, point in private_keys_to_points(keys, batch_size):
+        for suffix, pt in _with_siblings(point, siblings):
+            for fmt, program in point_to_programs(pt, formats):
+                if program in wanted[FORMAT_SPACES[fmt]]:
+                    yield key, fmt + suffix, program_to_address(fmt, program)
+
+def check_wifs(strings, targets, batch_size=BATCH_SIZE, stats=None):
+    """Yield (wif, pk_type, address) for every WIF string whose address is a target.
+
+    Strings that are not mainnet WIF keys are dropped by the checksum
+    prefilter before any EC work, and a valid key only derives the formats
+    of its compression flag.  If stats is a dict its 'valid' and
+    'rejected' counts are updated as strings are consumed.
+    """
+    wanted = target_programs(targets)
+    formats = {compressed: enabled_formats(wanted, fmts) for compressed, fmts in WIF_FORMATS.items()}
+    stats = {} if stats is None else stats
+    stats.setdefault('valid', 0)
+    stats.setdefault('rejected', 0)
+
+    def check(batch):
+        for (wif, _, compressed), point in zip(batch, ec_points([key for _, key, _ in batch])):
+            for fmt, program in point_to_programs(point, formats[compressed]):
+                if program in wanted[FORMAT_SPACES[fmt]]:
+                    yield wif, fmt, program_to_address(fmt, program)
+
+    batch = []
+    for s in strings:
+        decoded = _wif_decode(s)
+        if decoded is None:
+            stats['rejected'] += 1
+            continue
+        stats['valid'] += 1
+        key, compressed = decoded
+        if formats[compressed]:
+            batch.append((s, key, compressed))
+            if len(batch) >= batch_size:
+                yield from check(batch)
+                batch = []
+    if batch:
+        yield from check(batch)
+
+# Parallel checking.  Keys go to worker processes in chunks of
+# CHECK_CHUNK_BATCHES batches; a worker checks its chunk one batch at a
+# time and looks at a shared stop event before every batch, so once a hit
+# sets the event (stop_on_hit) every worker gives up within one batch.
+CHECK_CHUNK_BATCHES = 4
+_check_job = None
+
+def _init_check_worker(job, cpus, slots):
+    global _check_job, _key_cache
+    _check_job = job
+    _key_cache = job[-1]
+    if cpus:
+        with slots.get_lock():
+            slot = slots.value
+            slots.value += 1
+        os.sched_setaffinity(0, {cpus[slot % len(cpus)]})
+
+def _check_chunk(keys):
+    targets, formats, batch_size, stop, stop_on_hit, _ = _check_job
+    tested = 0
+
+    def until_stopped():
+        nonlocal tested
+        for i in range(0, len(keys), batch_size):
+            if stop.is_set():
+                return
+            batch = keys[i:i + batch_size]
+            tested += len(batch)
+            yield from batch
+
+    hits = []
+    for hit in check_keys(until_stopped(), targets, batch_size, formats=formats):
+        hits.append(hit)
+        if stop_on_hit:
+            stop.set()
+    return tested, hits
+
+def _affinity_cpus(affinity):
+    """The CPUs to pin workers to (None without affinity)."""
+    if not affinity:
+        return None
+    if not hasattr(os, 'sched_setaffinity'):
+        raise ValueError('CPU affinity is not supported on this platform')
+    return sorted(os.sched_getaffinity(0))
+
+def check_keys_parallel(keys, targets, workers=None, batch_size=BATCH_SIZE,
+                        chunk_batches=CHECK_CHUNK_BATCHES, formats=None, affinity=False,
+                        stop_on_hit=False, stats=None):
+    """check_keys across worker processes: yield (key, pk_type, address) per hit.
+
+    keys is consumed lazily, a few chunks per worker ahead of the checks.
+    With affinity=True the workers are pinned round-robin to the CPUs
+    this process may run on.  With stop_on_hit=True the first hit stops
+    the search: no more chunks are dispatched and the running workers
+    stop before their next batch; hits of the batches already checked are
+    still yielded.  If stats is a dict its 'tested' count is updated as
+    chunks complete, and its 'done' count is the number of keys from the
+    start of keys that are checked: chunks are collected in order, up to
+    the first one that a stop cut short.
+    """
+    import multiprocessing
+    workers = workers or multiprocessing.cpu_count()
+    cpus = _affinity_cpus(affinity)
+    stats = {} if stats is None else stats
+    stats.setdefault('tested', 0)
+    stats.setdefault('done', 0)
+    # Probe once in the parent so forked workers inherit the choice
+    if select_ec_backend() == 'pure':
+        load_g_table()
+
+    stop = multiprocessing.Event()
+    job = (targets, formats, batch_size, stop, stop_on_hit, _key_cache)
+    keys = iter(keys)
+    chunk_size = batch_size * chunk_batches
+    complete = True
+    with multiprocessing.Pool(workers, initializer=_init_check_worker,
+                              initargs=(job, cpus, multiprocessing.Value('i', 0))) as pool:
+        pending = collections.deque()
+        while True:
+            while not stop.is_set() and len(pending) < 2 * workers:
+                chunk = [key for _, key in zip(range(chunk_size), keys)]
+                if not chunk:
+                    break
+                pending.append((len(chunk), pool.apply_async(_check_chunk, (chunk,))))
+            if not pending:
+                break
+            size, result = pending.popleft()
+            tested, hits = result.get()
+            stats['tested'] += tested
+            if tested < size:
+                complete = False    # a stopped chunk ends the checked prefix
+            if complete:
+                stats['done'] += size
+            yield from hits
+
+# Shared-memory key rings.  A KeyRing is a single-producer single-consumer
+# queue of fixed records (32-byte key, uint32 label id) in one
+# multiprocessing.shared_memory block, so keys reach the workers without
+# pickling.  Keys and label ids are kept in two parallel arrays, so a run
+# of records is written with two slice copies.  Each header word has one
+# writer: the producer advances 'written' once its records are complete,
+# the consumer advances 'read' once it is done with them, so no locks are
+# needed.  A full ring makes the producer wait (backpressure); the
+# consumer stops once the ring is finished and drained.
+KEY_RING_RECORDS = 1 << 14
+KEY_RING_SPINS = 64             # polls of a full or empty ring that only yield the CPU
+KEY_RING_POLL = 0.0002          # seconds between the polls after those
+_RING_WRITTEN, _RING_READ, _RING_FINISHED, _RING_SIZE = range(4)
+_RING_HEADER = 32
+_RING_RECORD = 36               # key and label id
+
+class KeyRing:
+    """SPSC ring of (label id, 32-byte key) records in shared memory."""
+
+    def __init__(self, records=KEY_RING_RECORDS, name=None):
+        from multiprocessing import shared_memory
+        # Only the creating process frees the block, also after a fork
+        self._owner = os.getpid() if name is None else None
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=_RING_HEADER + records * _RING_RECORD)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._header = self._shm.buf[:_RING_HEADER].cast('Q')
+        if name is None:
+            self._header[_RING_SIZE] = records
+        self.size = size = self._header[_RING_SIZE]
+        self._keys = self._shm.buf[_RING_HEADER:_RING_HEADER + 32 * size]
+        self._labels = self._shm.buf[_RING_HEADER + 32 * size:_RING_HEADER + 36 * size].cast('I')
+
+    def __reduce__(self):
+        return KeyRing, (None, self._shm.name)
+
+    def __len__(self):
+        """Records written and not yet released by the consumer."""
+        return self._header[_RING_WRITTEN] - self._header[_RING_READ]
+
+    @property
+    def finished(self):
+        return bool(self._header[_RING_FINISHED])
+
+    def write(self, records):
+        """Append (label id, key) records while there is room; return how many fit.
+
+        Keys are 32 bytes or ints.  Never blocks: the caller offers the
+        rest again later, or to another ring.
+        """
+        written = self._header[_RING_WRITTEN]
+        count = min(len(records), self.size - (written - self._header[_RING_READ]))
+        done = 0
+        while done < count:
+            start = (written + done) % self.size
+            end = min(self.size, start + count - done)
+            run = records[done:done + end - start]
+            keys = [key for _, key in run]
+            try:
+                self._keys[32 * start:32 * end] = b''.join(keys)
+            except TypeError:
+                self._keys[32 * start:32 * end] = b''.join(
+                    key.to_bytes(32, 'big') if isinstance(key, int) else key for key in keys)
+            self._labels[start:end] = array.array('I', [label for label, _ in run])
+            done += end - start
+        # Publish the records only once they are complete
+        self._header[_RING_WRITTEN] = written + count
+        return count
+
+    def finish(self):
+        """Mark the end of the stream."""
+        self._header[_RING_FINISHED] = 1
+
+    def read(self, limit):
+        """Return (keys, label ids) views of up to limit unread records.
+
+        keys holds 32 bytes per record and label ids one integer each.
+        The records are contiguous in the ring, so there may be fewer than
+        are available where the ring wraps, and none if it is empty.  They
+        stay valid until they are released.
+        """
+        read = self._header[_RING_READ]
+        start = read % self.size
+        end = start + min(limit, self._header[_RING_WRITTEN] - read, self.size - start)
+        return self._keys[32 * start:32 * end], self._labels[start:end]
+
+    def release(self, count):
+        """Hand count read records back to the producer."""
+        self._header[_RING_READ] += count
+
+    @staticmethod
+    def wait(polls):
+        """Back off before poll number polls of a full or empty ring."""
+        if polls < KEY_RING_SPINS and hasattr(os, 'sched_yield'):
+            os.sched_yield()
+        else:
+            time.sleep(KEY_RING_POLL)
+
+    def batches(self, limit, stop=None):
+        """Yield (keys, label ids) views of up to limit records as they arrive.
+
+        Each pair of views is released when the next one is requested, or
+        when the generator is closed.  Ends once the ring is finished and
+        drained, or once the stop event is set.
+        """
+        polls = 0
+        while stop is None or not stop.is_set():
+            keys, labels = self.read(limit)
+            if labels:
+                polls = 0
+                count = len(labels)
+                try:
+                    yield keys, labels
+                finally:
+                    keys.release()
+                    labels.release()
+                self.release(count)
+            elif self.finished and not len(self):
+                return
+            else:
+                self.wait(polls)
+                polls += 1
+
+    def close(self):
+        """Detach from the shared memory; the creating process also frees it."""
+        for view in (self._keys, self._labels, self._header):
+            view.release()
+        self._shm.close()
+        if self._owner == os.getpid():
+            self._shm.unlink()
+
+def _ring_worker(ring, job, cpu, results):
+    global _key_cache
+    targets, formats, batch_size, stop, stop_on_hit, _key_cache = job
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    tested = 0
+    batches = ring.batches(batch_size, stop)
+    try:
+        for keys, labels in batches:
+            batch = {int.from_bytes(keys[32 * i:32 * i + 32], 'big'): label
+                     for i, label in enumerate(labels)}
+            tested += len(labels)
+            for key, pk_type, address in check_keys(batch, targets, batch_size, formats=formats):
+                results.put((batch[key], key.to_bytes(32, 'big'), pk_type, address))
+                if stop_on_hit:
+                    stop.set()
+    except BaseException:
+        # The producer reports the traceback instead of waiting for this ring
+        import traceback
+        results.put(traceback.format_exc())
+        raise
+    finally:
+        # Release the views of the current batch before detaching
+        batches.close()
+        ring.close()
+    results.put(tested)
+
+def check_keys_shared(records, targets, workers=None, batch_size=BATCH_SIZE, formats=None,
+                      affinity=False, stop_on_hit=False, ring_records=KEY_RING_RECORDS,
+                      stats=None):
+    """check_keys across worker processes fed through shared-memory KeyRings.
+
+    records yields (label id, key) pairs, keys as 32 bytes or ints and
+    label ids below 2^32.  Every worker reads its own ring and this
+    generator, the producer, hands each batch to the next ring with room.
+    Yields (label id, 32-byte key, pk_type, address) per hit; affinity,
+    stop_on_hit and stats are as for check_keys_parallel.
+    """
+    import multiprocessing
+    import queue
+    workers = workers or multiprocessing.cpu_count()
+    cpus = _affinity_cpus(affinity)
+    stats = {} if stats is None else stats
+    stats.setdefault('tested', 0)
+    if select_ec_backend() == 'pure':
+        load_g_table()
+
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    job = (targets, formats, batch_size, stop, stop_on_hit, _key_cache)
+    rings = [KeyRing(ring_records) for _ in range(workers)]
+    processes = [multiprocessing.Process(target=_ring_worker, daemon=True,
+                                         args=(ring, job, cpus and cpus[i % len(cpus)], results))
+                 for i, ring in enumerate(rings)]
+    running = workers
+
+    def collect(block):
+        nonlocal running
+        failed = False
+        while running:
+            try:
+                # Once a worker died, wait a little for its traceback
+                item = results.get(block or failed, 1.0)
+            except queue.Empty:
+                if failed:
+                    raise RuntimeError('A key ring worker failed')
+                failed = any(process.exitcode for process in processes)
+                if not block and not failed:
+                    return
+                continue
+            if isinstance(item, str):
+                raise RuntimeError(f'A key ring worker failed:\n{item}')
+            if isinstance(item, int):
+                stats['tested'] += item
+                running -= 1
+            else:
+                yield item
+
+    try:
+        for process in processes:
+            process.start()
+        records = iter(records)
+        batch = []
+        turn = 0
+        polls = 0
+        while not stop.is_set():
+            if not batch:
+                batch = [record for _, record in zip(range(batch_size), records)]
+                if not batch:
+                    break
+            for _ in range(workers):
+                count = rings[turn].write(batch)
+                turn = (turn + 1) % workers
+                if count:
+                    batch = batch[count:]
+                    polls = 0
+                    break
+            else:
+                if not any(process.is_alive() for process in processes):
+                    break       # no reader left to make room
+                KeyRing.wait(polls)
+                polls += 1
+            yield from collect(False)
+        for ring in rings:
+            ring.finish()
+        yield from collect(True)
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+        for ring in rings:
+            ring.close()
+
+# Checkpoints.  A long search saves its enumeration cursor and counters as
+# JSON every CHECKPOINT_SECONDS (or every so many candidates).  The cursor
+# only ever covers a prefix of the work whose checks are complete, so a
+# resumed search redoes at most the batches that were in flight.  The file
+# is written to a temporary name, synced and renamed over the old one, so
+# an interrupted save leaves the previous checkpoint intact.
+CHECKPOINT_SECONDS = 60
+
+class Checkpoint:
+    """Periodic atomic JSON checkpoints of one search.
+
+    search describes the search (its range, targets, options) and is
+    stored with every checkpoint; load() refuses a checkpoint that was
+    written for a different search.  Saves are due every seconds seconds
+    and/or every count candidates (either may be None).
+    """
+
+    def __init__(self, path, search, seconds=CHECKPOINT_SECONDS, count=None):
+        import json
+        self.path = path
+        self.search = json.loads(json.dumps(search))    # as it reads back
+        self.seconds = seconds
+        self.count = count
+        self.saved_at = time.time()
+        self.saved_count = 0
+
+    def load(self):
+        """Return the saved state; raise ValueError for another search's checkpoint."""
+        import json
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get('search') != self.search:
+            raise ValueError(f'Checkpoint {self.path} was written for a different search')
+        self.saved_count = data.get('count', 0)
+        return data['state']
+
+    def due(self, count):
+        """Whether a save is due with count candidates done."""
+        return ((self.seconds is not None and time.time() - self.saved_at >= self.seconds) or
+                (self.count is not None and count - self.saved_count >= self.count))
+
+    def save(self, state, count):
+        """Atomically replace the checkpoint with state (JSON-serializable)."""
+        import json
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'search': self.search, 'count': count, 'state': state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.saved_at = time.time()
+        self.saved_count = count
+
+    def update(self, count, state):
+        """Save state() if a save is due with count candidates done."""
+        if self.due(count):
+            self.save(state(), count)
+
+def add_checkpoint_arguments(parser):
+    """Add the --checkpoint/--resume options of the long-running searches."""
+    group = parser.add_argument_group('checkpoints')
+    group.add_argument('--checkpoint', metavar='PATH', help='save progress to this file')
+    group.add_argument('--resume', action='store_true',
+                       help='continue from the --checkpoint file')
+    group.add_argument('--checkpoint-seconds', type=float, default=CHECKPOINT_SECONDS,
+                       metavar='S', help=f'seconds between saves (default: {CHECKPOINT_SECONDS})')
+    group.add_argument('--checkpoint-count', type=int, metavar='N',
+                       help='also save after every N candidates')
+
+def open_checkpoint(parser, args, search):
+    """Return (Checkpoint or None, saved state or None) for the parsed options."""
+    if not args.checkpoint:
+        if args.resume:
+            parser.error('--resume needs --checkpoint PATH')
+        return None, None
+    checkpoint = Checkpoint(args.checkpoint, search, args.checkpoint_seconds,
+                            args.checkpoint_count)
+    if not args.resume:
+        return checkpoint, None
+    try:
+        return checkpoint, checkpoint.load()
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f'cannot resume: {e}')
+
+# BIP32 private derivation.  A hardened child needs only HMAC-SHA512 of
+# the parent key; a normal child hashes the parent's compressed public key,
+# so it costs one k * G (through the EC backend) on top.
+BIP32_HARDENED = 0x80000000
+
+def compressed_public_key(point):
+    """SEC1 compressed serialization of an affine point."""
+    x, y = point
+    return (b'\x03' if y & 1 else b'\x02') + x.to_bytes(32, 'big')
+
+def parse_bip32_path(path):
+    """Parse "m/44'/0'/0'/0/5" (' or h marks hardened) into a list of indices."""
+    parts = path.split('/')
+    if parts[0] != 'm':
+        raise ValueError(f'Invalid derivation path: {path}')
+    indices = []
+    for part in parts[1:]:
+        hardened = part[-1:] in ("'", 'h', 'H')
+        digits = part[:-1] if hardened else part
+        if not digits.isdigit() or int(digits) >= BIP32_HARDENED:
+            raise ValueError(f'Invalid derivation path: {path}')
+        indices.append(int(digits) + (BIP32_HARDENED if hardened else 0))
+    return indices
+
+def bip32_master_key(seed):
+    """Return (master private key, chain code) of a BIP32 seed."""
+    digest = hmac.new(b'Bitcoin seed', seed, hashlib.sha512).digest()
+    return int.from_bytes(digest[:32], 'big'), digest[32:]
+
+def bip32_child_key(key, chain_code, index, point=None):
+    """Return (child private key, child chain code); point may be key * G.
+
+    Returns None for an index that BIP32 skips as invalid (the tweak is
+    not below n or the child key is 0).
+    """
+    if index >= BIP32_HARDENED:
+        data = b'\x00' + key.to_bytes(32, 'big')
+    else:
+        data = compressed_public_key(point or ec_points([key])[0])
+    digest = hmac.digest(chain_code, data + index.to_bytes(4, 'big'), 'sha512')
+    tweak = int.from_bytes(digest[:32], 'big')
+    child = (tweak + key) % SECP256K1_N
+    if tweak >= SECP256K1_N or not child:
+        return None
+    return child, digest[32:]
+
+def bip32_derive(key, chain_code, path):
+    """Derive (private key, chain code) along path from an extended key.
+
+    Returns None if an index on the path is invalid.
+    """
+    for index in parse_bip32_path(path) if isinstance(path, str) else path:
+        derived = bip32_child_key(key, chain_code, index)
+        if derived is None:
+            return None
+        key, chain_code = derived
+    return key, chain_code
+
+def mnemonic_to_seed(mnemonic, passphrase=''):
+    """BIP39 seed: PBKDF2-HMAC-SHA512 of the mnemonic, 2048 iterations."""
+    return hashlib.pbkdf2_hmac('sha512', unicodedata.normalize('NFKD', mnemonic).encode(),
+                               ('mnemonic' + unicodedata.normalize('NFKD', passphrase)).encode(),
+                               2048)
+
+# Path sweeps.  Templates such as "m/84'/0'/0'/0/*" end in a wildcard that
+# is swept over an index range.  Every node above the wildcard is derived
+# once per seed and memoized, so sibling templates share their hardened
+# prefixes, and all leaves of one parent share its serialized public key:
+# a leaf costs one HMAC-SHA512 plus its own k * G, which goes through the
+# batch EC path (one shared inversion per batch with the pure backend).
+BIP32_TEMPLATES = {
+    # template -> address formats its wallets use (None: every format)
+    "m/0/*": None,
+    "m/0'/*'": None,
+    "m/44'/0'/0'/0/*": ('compressed',),
+    "m/49'/0'/0'/0/*": ('p2sh-p2wpkh',),
+    "m/84'/0'/0'/0/*": ('p2wpkh',),
+    "m/86'/0'/0'/0/*": ('p2tr',),
+}
+
+def parse_bip32_template(template):
+    """Split "m/44'/0'/0'/0/*" into (parent indices, hardened leaf)."""
+    head, _, leaf = template.rpartition('/')
+    if leaf not in ('*', "*'", '*h', '*H'):
+        raise ValueError(f'Template must end in /* or /*\': {template}')
+    return parse_bip32_path(head), leaf != '*'
+
+class Bip32Tree:
+    """The extended private keys of one seed, memoized by path."""
+    
+    def __init__(self, seed):
+        key, chain_code = bip32_master_key(seed)
+        self._nodes = {(): [key, chain_code, None]}
+    
+    def node(self, indices):
+        """Return [key, chain code, point or None] of the node at indices.
+
+        Returns None if an index on the path is invalid (see bip32_child_key).
+        """
+        indices = tuple(indices)
+        if indices in self._nodes:
+            return self._nodes[indices]
+        node = parent = self.node(indices[:-1])
+        if parent is not None:
+            key, chain_code, point = parent
+            if indices[-1] < BIP32_HARDENED and point is None:
+                point = self.point(indices[:-1])
+            derived = bip32_child_key(key, chain_code, indices[-1], point)
+            node = None if derived is None else list(derived) + [None]
+        self._nodes[indices] = node
+        return node
+    
+    def point(self, indices):
+        """Public point of the node at indices (computed once), None if it is invalid."""
+        node = self.node(indices)
+        if node is None:
+            return None
+        if node[2] is None:
+            node[2] = ec_points([node[0]])[0]
+        return node[2]
+    
+    def children(self, indices, child_indices):
+        """Return [(child index, child key)] of the node at indices.
+
+        The parent's key, chain code and public key serialization are looked
+        up once for the whole batch; children are not memoized.  Invalid
+        children, and all children of an invalid parent, are skipped.
+        """
+        node = self.node(indices)
+        if node is None:
+            return []
+        key, chain_code, _ = node
+        private = b'\x00' + key.to_bytes(32, 'big')
+        public = None
+        children = []
+        for index in child_indices:
+            if index >= BIP32_HARDENED:
+                data = private
+            else:
+                public = public or compressed_public_key(self.point(indices))
+                data = public
+            digest = hmac.digest(chain_code, data + index.to_bytes(4, 'big'), 'sha512')
+            tweak = int.from_bytes(digest[:32], 'big')
+            child = (tweak + key) % SECP256K1_N
+            if tweak < SECP256K1_N and child:   # otherwise BIP32 skips the index
+                children.append((index, child))
+        return children
+
+def bip32_sweep(tree, templates, indices, batch_size=BATCH_SIZE):
+    """Yield (path, key, point) for every template x leaf index.
+
+    tree is a Bip32Tree (or a seed); templates end in /* or /*'.
+    """
+    if not isinstance(tree, Bip32Tree):
+        tree = Bip32Tree(tree)
+    indices = list(indices)
+    for template in templates:
+        parent, hardened = parse_bip32_template(template)
+        leaf = BIP32_HARDENED if hardened else 0
+        prefix = template.rpartition('/')[0]
+        mark = "'" if hardened else ''
+        for start in range(0, len(indices), batch_size):
+            children = tree.children(parent, [i + leaf for i in indices[start:start + batch_size]])
+            points = ec_points([key for _, key in children])
+            for (index, key), point in zip(children, points):
+                yield f'{prefix}/{index - leaf}{mark}', key, point
+
+# Interval discrete logarithms.  When the public point Q of a key known to
+# lie in [start, end] is available, the key can be found in about sqrt(W)
+# group operations for an interval of width W instead of W.  Baby-step
+# giant-step is deterministic but holds its baby steps in memory, so the
+# table size follows a memory budget and the giant steps make up the rest.
+# Pollard's kangaroo method needs almost no memory: tame kangaroos start at
+# known multiples of G, wild ones at Q plus known offsets, all take
+# pseudo-random power-of-two jumps chosen by their x-coordinate, and the
+# points whose x has dp_bits low zero bits (distinguished points) are
+# reported to one table, where a tame and a wild kangaroo on the same
+# point give the key (van Oorschot-Wiener).  Each herd of kangaroos
+# shares one inversion per jump, and the herds run in worker processes.
+BSGS_ENTRY_BYTES = 120          # measured size of one baby-step dict entry
+BSGS_MEMORY = 256 * 1024 * 1024
+BSGS_CHUNK = 1024               # points per shared inversion in the walks
+KANGAROO_HERD = 64              # kangaroos per worker task
+KANGAROO_ROUND_STEPS = 256      # jumps per kangaroo per worker task
+KANGAROO_GIVE_UP = 32           # give up after this many times sqrt(W) jumps
+
+def decode_public_key(data):
+    """Parse a 33-byte compressed or 65-byte uncompressed SEC1 public key."""
+    p = SECP256K1_P
+    if len(data) == 33 and data[0] in (2, 3):
+        x = int.from_bytes(data[1:], 'big')
+        y = pow((x * x * x + 7) % p, (p + 1) // 4, p)
+        if x >= p or (y * y - x * x * x - 7) % p:
+            raise ValueError(f'Invalid public key: {data.hex()}')
+        return (x, y if y & 1 == data[0] & 1 else p - y)
+    if len(data) == 65 and data[0] == 4:
+        x = int.from_bytes(data[1:33], 'big')
+        y = int.from_bytes(data[33:], 'big')
+        if x >= p or y >= p or (y * y - x * x * x - 7) % p:
+            raise ValueError(f'Invalid public key: {data.hex()}')
+        return (x, y)
+    raise ValueError(f'Invalid public key: {data.hex()}')
+
+def consecutive_multiples(point, count, p):
+    """Return [point, 2 * point, ..., count * point] in affine form."""
+    multiples = []
+    acc = None
+    for _ in range(count):
+        acc = jacobian_add_affine(acc, point, p)
+        multiples.append(acc)
+    return batch_from_jacobian(multiples, p)
+
+def walk_progression(start, step, count, chunk=BSGS_CHUNK):
+    """Yield start + i * step for i in range(count), chunk points per inversion."""
+    p = SECP256K1_P
+    multiples = consecutive_multiples(step, min(chunk, max(count - 1, 1)), p)
+    current = start
+    yield current
+    emitted = 1
+    while emitted < count:
+        addends = multiples[:count - emitted]
+        points = addends if current is None else batch_add_affine(current, addends, p)
+        yield from points
+        emitted += len(points)
+        current = points[-1]
+
+def _check_interval(start, end):
+    if not 1 <= start <= end < SECP256K1_N:
+        raise ValueError(f'Invalid key interval: {start:#x}-{end:#x}')
+
+def _interval_key(point, candidates, start, end):
+    """The first candidate scalar (mod n) in [start, end] whose k * G is point."""
+    for k in candidates:
+        k %= SECP256K1_N
+        if start <= k <= end and ec_points([k])[0] == point:
+            return k
+    return None
+
+def bsgs_solve(point, start, end, memory=BSGS_MEMORY):
+    """Find k in [start, end] with k * G == point by baby-step giant-step.
+
+    The baby steps j * G for j = 1..m are stored by x-coordinate, which
+    matches both +j and -j, so each giant step of 2m + 1 covers 2m + 1
+    keys.  m is sqrt(W / 2) or what fits in memory bytes, whichever is
+    smaller.  Returns k, or None if the key is not in the interval.
+    """
+    _check_interval(start, end)
+    p, n = SECP256K1_P, SECP256K1_N
+    width = end - start + 1
+    m = max(1, min(math.isqrt(width // 2) + 1, memory // BSGS_ENTRY_BYTES))
+    mask = (1 << 64) - 1
+    table = {}
+    for j, baby in enumerate(walk_progression(SECP256K1_G, SECP256K1_G, m), 1):
+        table.setdefault(baby[0] & mask, j)
+
+    # R_i = Q - (start + m + i * (2m + 1)) * G has a key in [-m, m]
+    stride = 2 * m + 1
+    offset = (start + m) % n
+    origin = point_add(point, ec_points([(n - offset) % n])[0], p) if offset else point
+    step = ec_points([n - stride % n])[0]
+    giants = (width + stride - 1) // stride
+    for i, giant in enumerate(walk_progression(origin, step, giants)):
+        base = start + m + i * stride
+        if giant is None:
+            k = _interval_key(point, [base], start, end)
+        elif giant[0] & mask in table:
+            j = table[giant[0] & mask]
+            k = _interval_key(point, [base + j, base - j], start, end)
+        else:
+            continue
+        if k is not None:
+            return k
+    return None
+
+def kangaroo_jumps(width, kangaroos):
+    """[(size, point)] of power-of-two jumps with a mean near kangaroos * sqrt(W) / 4."""
+    mean = max(1, kangaroos * math.isqrt(width) // 4)
+    count = 1
+    while ((1 << count) - 1) // count < mean:
+        count += 1
+    sizes = [1 << i for i in range(count)]
+    return list(zip(sizes, ec_points(sizes)))
+
+def kangaroo_walk(herd, jumps, dp_mask, steps):
+    """Advance every kangaroo of herd by steps jumps; return the distinguished points.
+
+    herd is a list of [x, y, distance, wild] lists, updated in place; a
+    tame kangaroo's distance is its scalar, a wild one's its offset from
+    Q.  The result lists (index, x, y, distance, wild) for every point
+    passed whose x & dp_mask is zero.
+    """
+    p = SECP256K1_P
+    count = len(jumps)
+    found = []
+    for _ in range(steps):
+        picks = [jumps[kangaroo[0] % count] for kangaroo in herd]
+        inverses = batch_inverse([(jx - kangaroo[0]) % p or 1
+                                  for kangaroo, (_, (jx, _)) in zip(herd, picks)], p)
+        for i, (kangaroo, (size, jump), inv) in enumerate(zip(herd, picks, inverses)):
+            x, y = kangaroo[0], kangaroo[1]
+            if x == jump[0]:
+                point = point_add((x, y), jump, p)
+                if point is None:
+                    # Landed on infinity: jump once more, to the jump point
+                    point = jump
+                    kangaroo[2] += size
+                x3, y3 = point
+            else:
+                m = (jump[1] - y) * inv % p
+                x3 = (m * m - x - jump[0]) % p
+                y3 = (m * (x - x3) - y) % p
+            kangaroo[0] = x3
+            kangaroo[1] = y3
+            kangaroo[2] += size
+            if not x3 & dp_mask:
+                found.append((i, x3, y3, kangaroo[2], kangaroo[3]))
+    return found
+
+_kangaroo_job = None
+
+def _init_kangaroo_worker(job):
+    global _kangaroo_job
+    _kangaroo_job = job
+
+def _kangaroo_task(herd_id, herd):
+    jumps, dp_mask, steps = _kangaroo_job
+    return herd_id, herd, kangaroo_walk(herd, jumps, dp_mask, steps)
+
+def kangaroo_solve(point, start, end, workers=1, herd_size=KANGAROO_HERD, dp_bits=None,
+                   round_steps=KANGAROO_ROUND_STEPS, max_jumps=None, seed=None, progress=None):
+    """Find k in [start, end] with k * G == point by parallel kangaroos.
+
+    workers processes each advance one herd of herd_size kangaroos (half
+    tame, half wild) per task and return the distinguished points passed.
+    dp_bits defaults to a value that keeps the table small and the overhead
+    after a collision low.  Returns (k or None, total jumps); None means
+    max_jumps (default KANGAROO_GIVE_UP * sqrt(W) plus the distinguished
+    point overhead) passed without a collision.  progress, if given, is
+    called with the running jump count after every task.
+    """
+    _check_interval(start, end)
+    width = end - start + 1
+    rng = random.Random(seed)
+    kangaroos = workers * herd_size
+    if dp_bits is None:
+        dp_bits = max(0, (2 * math.isqrt(width) // (kangaroos * 16)).bit_length() - 1)
+    if max_jumps is None:
+        max_jumps = KANGAROO_GIVE_UP * (math.isqrt(width) + 1) + 4 * kangaroos * (1 << dp_bits)
+
+    def spawn(wild):
+        while True:
+            if not wild:
+                distance = start + rng.randrange(width)
+                return list(ec_points([distance])[0]) + [distance, False]
+            distance = rng.randrange(width)
+            pt = point_add(point, ec_points([distance])[0], SECP256K1_P)
+            if pt is not None:
+                return list(pt) + [distance, True]
+
+    herds = [[spawn(i % 2 == 1) for i in range(herd_size)] for _ in range(workers)]
+    job = (kangaroo_jumps(width, kangaroos), (1 << dp_bits) - 1, round_steps)
+    table = {}
+    jumps = 0
+    import multiprocessing
+    with multiprocessing.Pool(workers, initializer=_init_kangaroo_worker, initargs=(job,)) as pool:
+        pending = collections.deque(pool.apply_async(_kangaroo_task, (i, herd))
+                                    for i, herd in enumerate(herds))
+        while pending:
+            herd_id, herd, found = pending.popleft().get()
+            jumps += len(herd) * round_steps
+            for i, x, y, distance, wild in found:
+                other = table.setdefault(x, (y, distance, wild))
+                if other[2] == wild:
+                    if other[1] != distance:
+                        # Two tame or two wild kangaroos merged; restart this one
+                        herd[i] = spawn(wild)
+                    continue
+                tame_y, tame, wild_distance = (other[0], other[1], distance) if wild else (y, distance, other[1])
+                wild_y = y if wild else other[0]
+                sign = 1 if tame_y == wild_y else -1
+                k = _interval_key(point, [sign * tame - wild_distance], start, end)
+                if k is not None:
+                    return k, jumps
+            if progress is not None:
+                progress(jumps)
+            if jumps >= max_jumps:
+                break
+            pending.append(pool.apply_async(_kangaroo_task, (herd_id, herd)))
+    return None, jumps
+
+# Candidate transforms.  Transforms that are affine in the key,
+# k' = a * k + b, are derived from an already computed P = k * G as
+# a * P + b * G: negation and multiplication by 16^s cost a y-flip or 4s
+# doublings, and b * G comes from the fixed-base table.  Transforms of the
+# hex string that are not affine go through the batch path instead.
+AFFINE_TRANSFORMS = {
+    'complement': (-1, (1 << 256) - 1),   # (2^256 - 1) - k, the "yin yang" key
+    'negated': (-1, 0),                   # n - k
+}
+
+KEY_TRANSFORMS = {
+    'reversed': lambda h: h[::-1],
+    'nibble_swapped': lambda h: ''.join(h[i + 1] + h[i] for i in range(0, 64, 2)),
+    'byte_reversed': lambda h: ''.join(h[i:i + 2] for i in range(62, -2, -2)),
+}
+
+def offset_transform(c):
+    """Affine transform k + c (use a negative c for k - c)."""
+    return (f'{c:+#x}', 1, c)
+
+def shift_transform(s):
+    """Affine transform k * 16^s mod n."""
+    return (f'*16^{s}', 16 ** s, 0)
+
+def affine_transform_point(point, a, b):
+    """Return a * P + b * G for P = k * G, i.e. the point of a * k + b."""
+    p = SECP256K1_P
+    n = SECP256K1_N
+    a %= n
+    if point is None or a == 0:
+        result = None
+    elif a == 1:
+        result = to_jacobian(point)
+    elif a == n - 1:
+        result = (point[0], p - point[1], 1)
+    elif a & (a - 1) == 0:
+        result = to_jacobian(point)
+        for _ in range(a.bit_length() - 1):
+            result = jacobian_double(result, p)
+    else:
+        result = to_jacobian(scalar_mult_glv(a, point, p))
+    
+    if b % n:
+        result = jacobian_add(result, fixed_base_mult_jacobian(b), p)
+    return from_jacobian(result, p)
+
+def transformed_hash160s(key, transforms, point=None):
+    """Yield (name, key_hex, hash160_uncompressed, hash160_compressed) per transform.
+
+    transforms holds names from AFFINE_TRANSFORMS or KEY_TRANSFORMS, or
+    (name, a, b) tuples such as offset_transform(c) and shift_transform(s).
+    point may be the already computed public point of key.
+    """
+    k = private_key_to_int(key)
+    if point is None:
+        point = fixed_base_mult(k)
+    
+    fallback = {}   # key_hex -> transform names
+    for t in transforms:
+        if isinstance(t, tuple):
+            name, a, b = t
+        elif t in AFFINE_TRANSFORMS:
+            name, (a, b) = t, AFFINE_TRANSFORMS[t]
+        else:
+            fallback.setdefault(KEY_TRANSFORMS[t](format(k, '064x')), []).append(t)
+            continue
+        value = a * k + b
+        if not 0 <= value < 1 << 256:
+            value %= SECP256K1_N
+        derived = affine_transform_point(point, a, b)
+        if derived is not None:
+            yield (name, format(value, '064x')) + point_to_hash160s(derived)
+    
+    for key_hex, h_uncompressed, h_compressed in private_keys_to_hash160s(fallback):
+        for name in fallback[key_hex]:
+            yield name, key_hex, h_uncompressed, h_compressed
@@ -0,0 +1,120 @@
+"""
+Interval key search for a known public key
+Finds the private key of a public key known to lie in [START, END) in about
+sqrt(END - START) group operations instead of one scalar multiplication per
+key: Pollard's kangaroo method with distinguished points across worker
+processes, or baby-step giant-step within a memory budget.
+
+Usage: nesrd3q interval-search START END (--pubkey HEX ... | --tx FILE ...)
+                               [--method kangaroo|bsgs] [--workers N]
+                               [--memory MB] [--dp-bits B]
+START and END may be decimal or 0x-prefixed hex.  A --tx file holds a raw
+transaction in hex; every public key pushed by its inputs (scriptSig or
+witness) is tried.
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from .core import *
+
+def transaction_public_keys(raw):
+    """Return the distinct SEC1 public keys pushed anywhere in a raw transaction.
+
+    Script pushes and witness items both put the length byte (0x21 or
+    0x41) right before the key, so the bytes are scanned for that pattern
+    and only points on the curve are kept.
+    """
+    keys = []
+    for i in range(len(raw) - 33):
+        if raw[i] == 0x21 and raw[i + 1] in (2, 3):
+            data = raw[i + 1:i + 34]
+        elif raw[i] == 0x41 and raw[i + 1] == 4 and i + 66 <= len(raw):
+            data = raw[i + 1:i + 66]
+        else:
+            continue
+        try:
+            decode_public_key(data)
+        except ValueError:
+            continue
+        if data not in keys:
+            keys.append(data)
+    return keys
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('start', type=lambda s: int(s, 0))
+    parser.add_argument('end', type=lambda s: int(s, 0))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--pubkey', action='append', help='public key as hex (repeatable)')
+    source.add_argument('--tx', action='append', help='raw transaction hex file (repeatable)')
+    parser.add_argument('--method', choices=('kangaroo', 'bsgs'), default='kangaroo')
+    parser.add_argument('--workers', type=int, default=None, help='kangaroo worker processes (default: all cores)')
+    parser.add_argument('--memory', type=int, default=BSGS_MEMORY >> 20,
+                        help=f'BSGS baby-step table budget in MB (default: {BSGS_MEMORY >> 20})')
+    parser.add_argument('--dp-bits', type=int, default=None, help='distinguished point bits (default: auto)')
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.start < args.end <= SECP256K1_N:
+        parser.error('need 1 <= START < END <= n')
+    if args.pubkey:
+        public_keys = [bytes.fromhex(h) for h in args.pubkey]
+    else:
+        public_keys = []
+        for path in args.tx:
+            with open(path, 'r') as f:
+                public_keys.extend(transaction_public_keys(bytes.fromhex(''.join(f.read().split()))))
+    workers = args.workers or multiprocessing.cpu_count()
+
+    print("=" * 70)
+    print("INTERVAL KEY SEARCH")
+    print("=" * 70)
+    print(f"Interval: {args.start:#x} - {args.end:#x} (2^{(args.end - args.start).bit_length() - 1} wide)")
+    print(f"Method: {args.method}" + (f", {workers} workers" if args.method == 'kangaroo' else ''))
+    print(f"Public keys: {len(public_keys)}")
+    if select_ec_backend() == 'pure':
+        load_g_table()
+
+    found = 0
+    for data in public_keys:
+        try:
+            point = decode_public_key(data)
+        except ValueError as e:
+            print(f"\n{e}")
+            continue
+        print(f"\nPublic key: {data.hex()}")
+        began = time.time()
+        if args.method == 'bsgs':
+            key = bsgs_solve(point, args.start, args.end - 1, args.memory << 20)
+            detail = ''
+        else:
+            def progress(jumps):
+                rate = jumps / max(time.time() - began, 1e-9)
+                print(f"  {jumps:,} jumps  {rate:,.0f} jumps/s", end='\r', flush=True)
+            key, jumps = kangaroo_solve(point, args.start, args.end - 1, workers,
+                                        dp_bits=args.dp_bits, progress=progress)
+            detail = f", {jumps:,} jumps"
+        elapsed = time.time() - began
+
+        if key is None:
+            print(f"\n  Not found in the interval ({elapsed:.1f}s{detail})")
+            continue
+        found += 1
+        compressed = len(data) == 33
+        h = hash160(data)
+        print(f"\n{'='*70}")
+        print("FOUND MATCH")
+        print(f"Key: {key:064x}")
+        print(f"WIF: {wif_encode(key, compressed)}")
+        print(f"Type: {'compressed' if compressed else 'uncompressed'}")
+        print(f"Address: {hash160_to_address(h)}")
+        print(f"Time: {elapsed:.1f}s{detail}")
+        print(f"{'='*70}")
+
+    print("\n" + "=" * 70)
+    print(f"Search complete. {found} of {len(public_keys)} key(s) found.")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""
+Letter-to-hex mapping space search for the OTP 64-char key material
+The key is linear in the letter values: key = sum over letters L of
+v(L) * W_L, where W_L = sum of 16^(63-i) over the positions i of L.
+Walking the value assignments in Gray-code order changes one letter by one
+domain step at a time, i.e. one point addition per candidate.
+
+Usage: nesrd3q mapping-search [--preset known|full] [--fix L=V ...] [--domain L=VALUES ...]
+                              [--limit N] [--workers N] [--chunk N] [--types FORMATS]
+                              [--target ADDR ... | --index FILE]
+                              [--checkpoint PATH [--resume] [--checkpoint-seconds S] [--checkpoint-count N]]
+V and VALUES are hex digits, e.g. --fix A=a --domain Q=019
+A task's Gray-code walk can start at any index, so with --checkpoint the
+sweep saves its first unfinished task; --resume continues from there.
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from .blocks import otp_64
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+# The hand-picked mappings tried by key_search.py, deep_analysis.py and
+# extract_key.py, as letter index (A=0) -> hex value
+KNOWN_MAPPINGS = {
+    'mod16': lambda i: i % 16,
+    'A-F hex, others mod 16': lambda i: 10 + i if i < 6 else i % 16,
+    'A-F hex, others mod 10': lambda i: 10 + i if i < 6 else i % 10,
+    'V1 (A-F hex, G-P 0-9, Q-Z 0-9)': lambda i: 10 + i if i < 6 else (i - 6 if i < 16 else (i - 16) % 16),
+    'keep valid (g-j 0-3, k-n 4-7, o-r 8-b)': lambda i: 10 + i if i < 6 else (i - 6 if i < 18 else i % 16),
+}
+
+def letter_weights(text):
+    """W_L for every letter of text: the key value contributed by v(L) = 1."""
+    weights = {}
+    for pos, c in enumerate(text):
+        weights[c] = weights.get(c, 0) + 16 ** (len(text) - 1 - pos)
+    return weights
+
+def known_domains(letters):
+    """Per-letter values taken by any of the KNOWN_MAPPINGS."""
+    return {c: sorted({m(ord(c) - ord('A')) for m in KNOWN_MAPPINGS.values()}) for c in letters}
+
+def gray_position(radices, index):
+    """Digits and directions of the reflected mixed-radix Gray code at index.
+
+    Digit j sweeps its range once per step of the digits above it and is
+    reflected whenever that count of steps is odd, so both follow from
+    the mixed-radix digits of index.
+    """
+    digits = []
+    directions = []
+    for radix in radices:
+        index, digit = divmod(index, radix)
+        forward = index % 2 == 0
+        digits.append(digit if forward else radix - 1 - digit)
+        directions.append(1 if forward else -1)
+    return digits, directions
+
+def gray_code(radices, start=0):
+    """Reflected mixed-radix Gray code.
+
+    Yields (digit, step) after every change: digit index j was moved by
+    step (+1 or -1).  The assignment at index start (all zero for 0) is
+    not yielded.  Digit 0 changes fastest.
+    """
+    n = len(radices)
+    a, d = gray_position(radices, start)
+    while True:
+        j = 0
+        while j < n:
+            q = a[j] + d[j]
+            if 0 <= q < radices[j]:
+                break
+            d[j] = -d[j]
+            j += 1
+        if j == n:
+            return
+        a[j] = q
+        yield j, d[j]
+
+def step_points(letters, domains, weights):
+    """For each letter, the points (dom[i+1] - dom[i]) * W_L * G."""
+    jacobians = []
+    index = []
+    for c in letters:
+        dom = domains[c]
+        for i in range(len(dom) - 1):
+            index.append((c, i))
+            jacobians.append(fixed_base_mult_jacobian((dom[i + 1] - dom[i]) * weights[c]))
+    affine = batch_from_jacobian(jacobians, SECP256K1_P)
+    points = {c: [] for c in letters}
+    for (c, _), pt in zip(index, affine):
+        points[c].append(pt)
+    return points
+
+def sweep(base_value, letters, domains, weights, wanted, formats=P2PKH_FORMATS, start=0,
+          stop=None, batch_size=BATCH_SIZE):
+    """Walk the assignments of letters (others fixed in base_value).
+
+    base_value is the key with every letter in letters at domains[L][0].
+    wanted is a target_programs() dict and formats the address formats to
+    derive.
+    Only the Gray-code indices in [start, stop) are walked (stop=None for
+    all of them), so disjoint index ranges split a sweep.
+    Returns (tested, hits) where hits are (key_hex, pk_type, address).
+    """
+    p = SECP256K1_P
+    points = step_points(letters, domains, weights)
+    radices = [len(domains[c]) for c in letters]
+    position, _ = gray_position(radices, start)
+
+    deltas = [[(domains[c][i + 1] - domains[c][i]) * weights[c] for i in range(radix - 1)]
+              for c, radix in zip(letters, radices)]
+
+    value = base_value + sum((domains[c][i] - domains[c][0]) * weights[c]
+                             for c, i in zip(letters, position))
+    current = fixed_base_mult_jacobian(value)
+    pending_values = [value]
+    pending_points = [current]
+    hits = []
+    tested = 0
+
+    def flush():
+        nonlocal tested
+        for v, pt in zip(pending_values, batch_from_jacobian(pending_points, p)):
+            if pt is None:
+                continue
+            tested += 1
+            for fmt, program in point_to_programs(pt, formats):
+                if program in wanted[FORMAT_SPACES[fmt]]:
+                    hits.append((format(v, '064x'), fmt, program_to_address(fmt, program)))
+        pending_values.clear()
+        pending_points.clear()
+
+    for index, (j, step) in enumerate(gray_code(radices, start), start + 1):
+        if stop is not None and index >= stop:
+            break
+        i = position[j] if step > 0 else position[j] - 1
+        x, y = points[letters[j]][i]
+        if step > 0:
+            value += deltas[j][i]
+        else:
+            value -= deltas[j][i]
+            y = p - y
+        position[j] += step
+        current = jacobian_add_affine(current, (x, y), p)
+        pending_values.append(value)
+        pending_points.append(current)
+        if len(pending_points) >= batch_size:
+            flush()
+    flush()
+    return tested, hits
+
+# Inner Gray-code indices per worker task; small enough for a steady
+# progress readout and little rework on resume
+MAPPING_CHUNK = 1 << 16
+
+_job = None
+
+def _init_worker(job):
+    global _job
+    _job = job
+
+def _sweep_task(task):
+    """Sweep an index range of the inner letters with the outer letters fixed."""
+    number, outer_assignment, start, stop = task
+    base_value, inner, outer, domains, weights, wanted, formats = _job
+    value = base_value + sum(v * weights[c] for c, v in zip(outer, outer_assignment))
+    return (number,) + sweep(value, inner, domains, weights, wanted, formats, start, stop)
+
+def mapping_search(text, domains, targets, limit=None, workers=None, chunk_size=MAPPING_CHUNK,
+                   checkpoint=None, state=None, formats=P2PKH_FORMATS):
+    """Check every mapping of text's letters into their domains; return hits.
+
+    targets is a list of addresses or a TargetIndex.
+    The sweep is split into numbered tasks of chunk_size mappings.  A
+    Checkpoint gets the number of the first unfinished task (the cursor)
+    with the mappings tested and the hits before it; state is such a
+    saved state to resume.
+    """
+    weights = letter_weights(text)
+    wanted = target_programs(targets)
+    formats = enabled_formats(wanted, formats)
+
+    # Letters with a single value are folded into the base key; the rest are
+    # ordered by domain size so the largest domains vary fastest
+    base_value = sum(domains[c][0] * weights[c] for c in weights)
+    free = sorted((c for c in weights if len(domains[c]) > 1), key=lambda c: -len(domains[c]))
+
+    # Fix the slowest letters per task so workers get disjoint sub-sweeps
+    outer = []
+    tasks = 1
+    while free and tasks < 64 and limit is None:
+        c = free.pop()
+        outer.append(c)
+        tasks *= len(domains[c])
+
+    inner_base = base_value - sum(domains[c][0] * weights[c] for c in outer)
+    assignments = [()]
+    for c in outer:
+        assignments = [a + (v,) for a in assignments for v in domains[c]]
+    inner_total = 1
+    for c in free:
+        inner_total *= len(domains[c])
+    if limit is not None:
+        inner_total = min(inner_total, limit)
+    total = len(assignments) * inner_total
+
+    cursor = 0
+    tested = 0
+    hits = []
+    if state:
+        cursor, tested = state['cursor'], state['tested']
+        hits = [tuple(hit) for hit in state['hits']]
+        print(f"Resuming at task {cursor:,}: {tested:,} mappings tested, "
+              f"{len(hits)} match(es) so far")
+    tasks = ((number, assignment, s, min(s + chunk_size, inner_total))
+             for number, (assignment, s) in enumerate(
+                 (a, s) for a in assignments for s in range(0, inner_total, chunk_size))
+             if number >= cursor)
+
+    # Tasks complete out of order; the cursor only advances over the tasks
+    # finished from it on, so a checkpoint never skips a gap
+    finished = {}   # task number -> (tested, hits)
+    resumed = swept = tested
+    began = time.time()
+    job = (inner_base, free, outer, domains, weights, wanted, formats)
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(job,)) as pool:
+            for number, count, task_hits in pool.imap_unordered(_sweep_task, tasks):
+                swept += count
+                finished[number] = (count, task_hits)
+                while cursor in finished:
+                    count, task_hits = finished.pop(cursor)
+                    tested += count
+                    hits.extend(task_hits)
+                    cursor += 1
+                if checkpoint:
+                    checkpoint.update(tested, lambda: {'cursor': cursor, 'tested': tested, 'hits': hits})
+                elapsed = time.time() - began
+                print(f"  {swept:,}/{total:,} mappings  {(swept - resumed) / elapsed:,.0f} keys/s",
+                      end='\r', flush=True)
+    finally:
+        # Also on errors and interrupts: the cursor covers finished tasks only
+        if checkpoint:
+            checkpoint.save({'cursor': cursor, 'tested': tested, 'hits': hits}, tested)
+    print(f"  {tested:,}/{total:,} mappings  {(tested - resumed) / (time.time() - began):,.0f} keys/s")
+    return hits
+
+def parse_assignments(items):
+    """Parse ["A=0a", "Q=9"] into {"A": [0, 10], "Q": [9]}."""
+    result = {}
+    for item in items or []:
+        letter, values = item.split('=')
+        result[letter.upper()] = sorted({int(v, 16) for v in values})
+    return result
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--text', help='64 letters A-Z (default: OTP 64 chars after YOUWON)')
+    parser.add_argument('--preset', choices=('known', 'full'), default='known',
+                        help='known: values used by the existing mappings; full: all 16')
+    parser.add_argument('--fix', action='append', help='fix a letter, e.g. A=a')
+    parser.add_argument('--domain', action='append', help='restrict a letter, e.g. Q=019')
+    parser.add_argument('--limit', type=int, help='stop after this many mappings')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk', type=int, default=MAPPING_CHUNK, help='mappings per worker task')
+    parser.add_argument('--types', default='uncompressed,compressed',
+                        help='comma-separated address formats to check: ' + ','.join(ADDRESS_FORMATS))
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args(argv)
+
+    text = (args.text or otp_64()).upper()
+    if len(text) != 64 or not text.isalpha():
+        parser.error('text must be 64 letters')
+
+    letters = sorted(set(text))
+    if args.preset == 'known':
+        domains = known_domains(letters)
+    else:
+        domains = {c: list(range(16)) for c in letters}
+    domains.update(parse_assignments(args.domain))
+    domains.update(parse_assignments(args.fix))
+    types = tuple(args.types.split(','))
+    checkpoint, state = open_checkpoint(parser, args, {
+        'command': 'mapping-search', 'text': text, 'domains': domains, 'limit': args.limit,
+        'chunk': args.chunk, 'types': types, 'target': args.target, 'index': args.index})
+
+    print("=" * 70)
+    print("MAPPING SPACE SEARCH")
+    print("=" * 70)
+    print(f"Text: {text}")
+    size = 1
+    for c in letters:
+        size *= len(domains[c])
+        print(f"  {c}: {''.join(format(v, 'x') for v in domains[c])}")
+    print(f"Mapping space: {size:,} keys")
+
+    load_g_table()  # map the table once so forked workers share it
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    hits = mapping_search(text, domains, targets, args.limit, args.workers,
+                          args.chunk, checkpoint, state, types)
+
+    for found_key, pk_type, addr in hits:
+        print(f"\n{'='*70}")
+        print("FOUND MATCH")
+        print(f"Key: {found_key}")
+        print(f"Type: {pk_type}")
+        print(f"Address: {addr}")
+        print(f"{'='*70}")
+
+    print("\n" + "=" * 70)
+    print(f"Search complete. {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
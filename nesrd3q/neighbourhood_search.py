@@ -0,0 +1,220 @@
+"""
+Hamming-neighbourhood search around a candidate key for NESRD3Q puzzle
+Changing nibble i of the key by d shifts the public key by d*16^(63-i)*G,
+so every neighbour is one point addition away from its parent.
+
+Usage: nesrd3q neighbourhood-search [--key HEX] [--distance 1-3] [--mode nibble|bit]
+                                    [--trusted POSITIONS] [--workers N] [--types FORMATS]
+                                    [--target ADDR ... | --index FILE]
+POSITIONS is a comma-separated list of indices or ranges, e.g. "0-3,60,63".
+"""
+
+import argparse
+import multiprocessing
+import time
+from math import comb
+
+from .blocks import otp_64
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+def default_key():
+    """The OTP mod 16 candidate used as the main key by final_search.py."""
+    return ''.join(format((ord(c) - ord('A')) % 16, 'x') for c in otp_64())
+
+def parse_positions(spec):
+    """Parse "0-3,60,63" into a set of positions."""
+    positions = set()
+    for part in filter(None, spec.split(',')):
+        if '-' in part:
+            lo, hi = part.split('-')
+            positions.update(range(int(lo), int(hi) + 1))
+        else:
+            positions.add(int(part))
+    return positions
+
+def mutation_units(key, mode='nibble', trusted=()):
+    """List the single-position changes of key as (position, new_digit, delta).
+
+    Positions count from the most significant nibble (or bit) as index 0.
+    delta is the signed change of the key's integer value.
+    """
+    if mode == 'nibble':
+        width, radix = 4, 16
+    elif mode == 'bit':
+        width, radix = 1, 2
+    else:
+        raise ValueError(f'Unknown mode: {mode}')
+
+    value = int(key, 16)
+    length = 256 // width
+    units = []
+    for pos in range(length):
+        if pos in trusted:
+            continue
+        shift = width * (length - 1 - pos)
+        digit = (value >> shift) & (radix - 1)
+        for new in range(radix):
+            if new != digit:
+                units.append((pos, new, (new - digit) << shift))
+    return units
+
+def delta_points(units):
+    """Affine points delta*G for every mutation unit (one shared inversion)."""
+    return batch_from_jacobian(
+        [fixed_base_mult_jacobian(delta % SECP256K1_N) for _, _, delta in units], SECP256K1_P)
+
+def count_neighbours(units, distance):
+    """Number of keys within the given distance (excluding the key itself)."""
+    per_position = {}
+    for pos, _, _ in units:
+        per_position[pos] = per_position.get(pos, 0) + 1
+    # Every position offers the same number of alternatives
+    alternatives = max(per_position.values(), default=0)
+    return sum(comb(len(per_position), j) * alternatives ** j for j in range(1, distance + 1))
+
+def check_point(point, value, wanted, formats, hits):
+    """Append (key_hex, pk_type, address) to hits for every wanted program of point.
+
+    wanted is a target_programs() dict and formats the address formats to
+    derive.
+    """
+    for fmt, program in point_to_programs(point, formats):
+        if program in wanted[FORMAT_SPACES[fmt]]:
+            hits.append((format(value, '064x'), fmt, program_to_address(fmt, program)))
+
+def next_position(units, i):
+    """Index of the first unit after units[i] that mutates a different position."""
+    pos = units[i][0]
+    i += 1
+    while i < len(units) and units[i][0] == pos:
+        i += 1
+    return i
+
+def search_from(point, value, units, points, first, depth, wanted, formats, hits):
+    """Test every neighbour that mutates units[first:] at up to depth positions.
+
+    All children of one parent are produced by a single batch_add_affine
+    call; each child is then expanded further with the positions after its
+    own, so no combination is visited twice.  A key that is 0 mod n (point
+    None, at infinity) is not tested, but its children are.  Returns the
+    number tested.
+    """
+    if point is None:
+        children = points[first:]
+    else:
+        children = batch_add_affine(point, points[first:], SECP256K1_P)
+    tested = 0
+    for offset, child in enumerate(children):
+        i = first + offset
+        child_value = value + units[i][2]
+        if child is not None:
+            tested += 1
+            check_point(child, child_value, wanted, formats, hits)
+        if depth > 1:
+            nxt = next_position(units, i)
+            if nxt < len(units):
+                tested += search_from(child, child_value, units, points, nxt, depth - 1,
+                                      wanted, formats, hits)
+    return tested
+
+_job = None
+
+def _init_worker(job):
+    global _job
+    _job = job
+
+def _search_task(i):
+    """Mutate units[i] first, then search deeper from there."""
+    key_value, base, units, points, distance, wanted, formats = _job
+    hits = []
+    child = point_add(base, points[i], SECP256K1_P)
+    value = key_value + units[i][2]
+    tested = 0
+    if child is not None:
+        check_point(child, value, wanted, formats, hits)
+        tested = 1
+    nxt = next_position(units, i)
+    if distance > 1 and nxt < len(units):
+        tested += search_from(child, value, units, points, nxt, distance - 1, wanted, formats,
+                              hits)
+    return tested, hits
+
+def neighbourhood_search(key, targets, distance=1, mode='nibble', trusted=(), workers=None,
+                         formats=P2PKH_FORMATS):
+    """Check every key within Hamming distance of key; return the hits.
+
+    targets is a list of addresses or a TargetIndex.
+    """
+    if not 1 <= distance <= 3:
+        raise ValueError('distance must be 1, 2 or 3')
+
+    wanted = target_programs(targets)
+    formats = enabled_formats(wanted, formats)
+    key_value = int(key, 16)
+    base = fixed_base_mult(key_value)
+    units = mutation_units(key, mode, trusted)
+    points = delta_points(units)
+    total = count_neighbours(units, distance)
+
+    hits = []
+    if base is not None:
+        check_point(base, key_value, wanted, formats, hits)
+
+    tested = 0
+    began = time.time()
+    job = (key_value, base, units, points, distance, wanted, formats)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(job,)) as pool:
+        for count, task_hits in pool.imap_unordered(_search_task, range(len(units))):
+            tested += count
+            hits.extend(task_hits)
+            elapsed = time.time() - began
+            print(f"  {tested:,}/{total:,} neighbours  {tested / elapsed:,.0f} keys/s",
+                  end='\r', flush=True)
+    print()
+    return hits
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--key', help='base candidate (64 hex chars, default: OTP mod 16)')
+    parser.add_argument('--distance', type=int, default=1, help='maximum Hamming distance (1-3)')
+    parser.add_argument('--mode', choices=('nibble', 'bit'), default='nibble')
+    parser.add_argument('--trusted', default='', help='positions that are never mutated')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--types', default='uncompressed,compressed',
+                        help='comma-separated address formats to check: ' + ','.join(ADDRESS_FORMATS))
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    args = parser.parse_args(argv)
+
+    key = (args.key or default_key()).lower()
+    if len(key) != 64 or not all(c in '0123456789abcdef' for c in key):
+        parser.error('key must be 64 hex characters')
+
+    print("=" * 70)
+    print("NEIGHBOURHOOD SEARCH")
+    print("=" * 70)
+    print(f"Base key: {key}")
+    print(f"Mode: {args.mode}, distance <= {args.distance}")
+
+    load_g_table()  # map the table once so forked workers share it
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    hits = neighbourhood_search(key, targets, args.distance, args.mode,
+                                parse_positions(args.trusted), args.workers,
+                                tuple(args.types.split(',')))
+
+    for found_key, pk_type, addr in hits:
+        print(f"\n{'='*70}")
+        print("FOUND MATCH")
+        print(f"Key: {found_key}")
+        print(f"Type: {pk_type}")
+        print(f"Address: {addr}")
+        print(f"{'='*70}")
+
+    print("\n" + "=" * 70)
+    print(f"Search complete. {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Sequential keyspace range scan for NESRD3Q Bitcoin puzzle
+Walks [start, end) with one point addition per key instead of a full
+scalar multiplication: key k+1's public key is P + G.
+
+Usage: nesrd3q range-scan START END [--workers N] [--batch B] [--types FORMATS] [--siblings]
+                          [--target ADDR ... | --index FILE]
+                          [--checkpoint PATH [--resume] [--checkpoint-seconds S] [--checkpoint-count N]]
+START and END may be decimal or 0x-prefixed hex.  With --checkpoint the
+scan saves the start of its first unfinished chunk; --resume continues
+from there.
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import time
+
+from .core import *
+from .core import _with_siblings
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+# Keys handed to a worker per task; small enough for a steady progress readout
+CHUNK_SIZE = 1 << 16
+
+_offsets = None
+
+def offset_points(batch_size):
+    """Return [1*G, 2*G, ..., batch_size*G] in affine form."""
+    global _offsets
+    if _offsets is None or len(_offsets) != batch_size:
+        multiples = []
+        acc = None
+        for _ in range(batch_size):
+            acc = jacobian_add_affine(acc, SECP256K1_G, SECP256K1_P)
+            multiples.append(acc)
+        _offsets = batch_from_jacobian(multiples, SECP256K1_P)
+    return _offsets
+
+def scan_points(start, end, batch_size=BATCH_SIZE):
+    """Yield (key, point) for every key in [start, end), 1 <= start.
+
+    Each block of batch_size keys is produced from the block's first point
+    by batch_add_affine with the precomputed offsets i*G, so a key costs one
+    affine addition with a shared inversion.  The last sum of a block is the
+    first point of the next one.
+    """
+    offsets = offset_points(batch_size)
+    key = start
+    point = fixed_base_mult(key)
+    while key < end:
+        count = min(batch_size, end - key)
+        nxt = batch_add_affine(point, offsets[:count], SECP256K1_P)
+        yield key, point
+        for i in range(count - 1):
+            yield key + i + 1, nxt[i]
+        key += count
+        point = nxt[-1]
+
+def scan_range(start, end, wanted, types=P2PKH_FORMATS, batch_size=BATCH_SIZE, siblings=False):
+    """Scan [start, end) and return [(key, pk_type, program)] for target hits.
+
+    wanted is a target_programs() dict and types the address formats to
+    derive.  With siblings=True the keys n - k, lambda * k and lambda^2 * k
+    of every scanned key are tested as well (pk_type gets a ':negated',
+    ':lambda' or ':lambda2' suffix and the reported key is the sibling's).
+    """
+    sha256 = hashlib.sha256
+    p2pkh = wanted.get('p2pkh', ())
+    check_uncompressed = 'uncompressed' in types
+    check_compressed = 'compressed' in types
+    others = tuple(fmt for fmt in types if FORMAT_SPACES[fmt] != 'p2pkh')
+    hits = []
+    for key, point in scan_points(start, end, batch_size):
+        for suffix, (x, y) in _with_siblings(point, siblings):
+            x_bytes = x.to_bytes(32, 'big')
+            if check_compressed:
+                h = ripemd160_32(sha256((b'\x03' if y & 1 else b'\x02') + x_bytes).digest())
+                if h in p2pkh:
+                    hits.append((sibling_key(key, suffix[1:]) if suffix else key,
+                                 'compressed' + suffix, h))
+            if check_uncompressed:
+                h = ripemd160_32(sha256(b'\x04' + x_bytes + y.to_bytes(32, 'big')).digest())
+                if h in p2pkh:
+                    hits.append((sibling_key(key, suffix[1:]) if suffix else key,
+                                 'uncompressed' + suffix, h))
+            for fmt, program in point_to_programs((x, y), others):
+                if program in wanted[FORMAT_SPACES[fmt]]:
+                    hits.append((sibling_key(key, suffix[1:]) if suffix else key,
+                                 fmt + suffix, program))
+    return hits
+
+def _scan_task(args):
+    start, end, wanted, types, batch_size, siblings = args
+    return start, end, scan_range(start, end, wanted, types, batch_size, siblings)
+
+def split_range(start, end, chunk_size=CHUNK_SIZE):
+    """Split [start, end) into disjoint consecutive subranges."""
+    for s in range(start, end, chunk_size):
+        yield s, min(s + chunk_size, end)
+
+def run_scan(start, end, targets, workers=None, types=P2PKH_FORMATS,
+             batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE, siblings=False,
+             checkpoint=None, state=None):
+    """Scan [start, end) across worker processes and report progress and hits.
+
+    targets is a list of addresses or a TargetIndex.  A Checkpoint gets
+    the start of the first unfinished chunk (the cursor) with the keys
+    done and the hits below it; state is such a saved state to resume.
+    """
+    if start < 1 or end > SECP256K1_N or start >= end:
+        raise ValueError('Range must satisfy 1 <= start < end <= n')
+
+    wanted = target_programs(targets)
+    types = enabled_formats(wanted, types)
+    load_g_table()  # map the table once so forked workers share it
+
+    factor = 4 if siblings else 1
+    total = (end - start) * factor
+    cursor = start
+    done = 0
+    hits = []
+    if state:
+        cursor, done = state['cursor'], state['done']
+        hits = [tuple(hit) for hit in state['hits']]
+        print(f"Resuming at {cursor:#x}: {done:,} keys done, {len(hits)} match(es) so far")
+    tasks = ((s, e, wanted, types, batch_size, siblings)
+             for s, e in split_range(cursor, end, chunk_size))
+
+    # Chunks complete out of order; the cursor only advances over the
+    # chunks finished from it on, so a checkpoint never skips a gap
+    finished = {}   # chunk start -> (end, hits)
+    resumed = scanned = done
+    began = time.time()
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            for s, e, chunk_hits in pool.imap_unordered(_scan_task, tasks):
+                scanned += (e - s) * factor
+                found = []
+                for key, pk_type, program in chunk_hits:
+                    address = program_to_address(pk_type.split(':')[0], program)
+                    print(f"\n{'='*70}")
+                    print("FOUND MATCH")
+                    print(f"Key: {key:064x}")
+                    print(f"Type: {pk_type}")
+                    print(f"Address: {address}")
+                    print(f"{'='*70}")
+                    found.append((key, pk_type, address))
+                finished[s] = (e, found)
+                while cursor in finished:
+                    chunk_end, found = finished.pop(cursor)
+                    done += (chunk_end - cursor) * factor
+                    hits.extend(found)
+                    cursor = chunk_end
+                if checkpoint:
+                    checkpoint.update(done, lambda: {'cursor': cursor, 'done': done, 'hits': hits})
+                elapsed = time.time() - began
+                print(f"  {scanned:,}/{total:,} keys  {(scanned - resumed) / elapsed:,.0f} keys/s",
+                      end='\r', flush=True)
+    finally:
+        # Also on errors and interrupts: the cursor covers finished chunks only
+        if checkpoint:
+            checkpoint.save({'cursor': cursor, 'done': done, 'hits': hits}, done)
+    print()
+    return hits
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('start', type=lambda s: int(s, 0))
+    parser.add_argument('end', type=lambda s: int(s, 0))
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--batch', type=int, default=BATCH_SIZE, help='keys per shared inversion')
+    parser.add_argument('--chunk', type=int, default=CHUNK_SIZE, help='keys per worker task')
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    parser.add_argument('--types', default='uncompressed,compressed',
+                        help='comma-separated address formats to check: ' + ','.join(ADDRESS_FORMATS))
+    parser.add_argument('--siblings', action='store_true',
+                        help='also test n-k, lambda*k and lambda^2*k for every key')
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args(argv)
+
+    types = tuple(args.types.split(','))
+    checkpoint, state = open_checkpoint(parser, args, {
+        'command': 'range-scan', 'start': args.start, 'end': args.end, 'chunk': args.chunk,
+        'types': types, 'siblings': args.siblings, 'target': args.target, 'index': args.index})
+
+    print("=" * 70)
+    print("RANGE SCAN")
+    print("=" * 70)
+    print(f"Range: [{args.start:#x}, {args.end:#x})  ({args.end - args.start:,} keys)")
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    hits = run_scan(args.start, args.end, targets, args.workers, types,
+                    args.batch, args.chunk, args.siblings, checkpoint, state)
+
+    print("\n" + "=" * 70)
+    print(f"Scan complete. {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,466 @@
+"""
+Candidate key strategies for the DBBI/FAED/OTP key material
+Every approach of the old search scripts is a registered strategy: a
+generator of (label, candidate) pairs, where a candidate is a 32-byte key,
+64 hex digits or a WIF.  One runner checks the selected strategies
+together: keys are deduplicated across strategies, checked in batches (one
+shared inversion per batch, the key cache when it is enabled) and every
+match is reported with all labels of its key whose formats allow it.
+Strategies are selected by name or by tag; the tags are the families
+(otp, faed, dots, sha256, ...) and the scripts they came from
+(key-search, final-search, ...).
+
+Usage: nesrd3q strategies [NAME|TAG ...] [--list] [--batch B] [--workers N] [--affinity]
+                          [--shared-memory] [--stop-on-hit] [--target ADDR ... | --index FILE]
+                          [--solution-file PATH]
+                          [--checkpoint PATH [--resume] [--checkpoint-seconds S] [--checkpoint-count N]]
+With no NAME or TAG every strategy is run.  With --checkpoint the run saves
+how far into which strategy its checks are done; --resume continues there.
+"""
+
+import argparse
+import collections
+import hashlib
+import itertools
+import time
+
+from . import blocks
+from .ciphers import OTP_KEY, bifid_decrypt, create_square, otp_decrypt
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+# The 14x14 dots pattern of the puzzle image, row by row
+DOTS_PATTERN = """. . . . . . 0 1 . . . . . . . . . . . 1 . . . . . 0 0 . . . . . . . . . 0 0 . . . . . . . . . 0 1 . . . . . . . . . . 1 . . . . . . 0 0 . . . . . . . . . 0 0 . . 0 0 . . . . . . 1 . . . . . . 0 0 . . 1 . . . . 0 . . . . . 0 . . . . 0 . 0 0 . . . . . . . . 1 . 0 . . . . . . . . . . . . 1 . . . . . 0 0 . . . . . . 0 1 . . . . 0 0 . . . . . . 0 0 1 . . . . . 0 0 . . . . . 0 . . . . . . 0 0 ."""
+DOTS = DOTS_PATTERN.split()
+POS_0 = [i for i, d in enumerate(DOTS) if d == '0']
+POS_1 = [i for i, d in enumerate(DOTS) if d == '1']
+NON_DOT = sorted(POS_0 + POS_1)
+
+# Strategy name -> (tags, generator function), in registration order
+STRATEGIES = {}
+
+def strategy(name, *tags):
+    """Register a generator function of (label, candidate) as strategy name."""
+    def register(fn):
+        STRATEGIES[name] = (frozenset(tags), fn)
+        return fn
+    return register
+
+def strategy_tags():
+    return sorted(set().union(*(tags for tags, _ in STRATEGIES.values())))
+
+def select_strategies(selectors=()):
+    """Return the names of the strategies matching any selector (a name or a tag).
+
+    Names come back in registration order; no selectors selects every
+    strategy.  Raises ValueError for a selector that is neither.
+    """
+    if not selectors:
+        return list(STRATEGIES)
+    tags = set(strategy_tags())
+    unknown = [s for s in selectors if s not in STRATEGIES and s not in tags]
+    if unknown:
+        raise ValueError(f"Unknown strategy or tag: {', '.join(unknown)}")
+    wanted = set(selectors)
+    return [name for name, (tags, _) in STRATEGIES.items() if name in wanted or tags & wanted]
+
+def parse_candidate(candidate):
+    """(32-byte key, formats) of a strategy candidate, None if it is no key.
+
+    A candidate is a 32-byte key or a string of 64 hex digits, which
+    allow every address format, or a WIF, which allows only the formats
+    of its compression flag (see candidate_private_key).
+    """
+    if isinstance(candidate, bytes):
+        return candidate, ADDRESS_FORMATS
+    parsed = candidate_private_key(candidate, ADDRESS_FORMATS)
+    if parsed is None:
+        return None
+    key, formats = parsed
+    return key.to_bytes(32, 'big'), formats
+
+def run_strategies(names, targets, batch_size=BATCH_SIZE, stats=None, workers=1,
+                   affinity=False, stop_on_hit=False, shared_memory=False,
+                   checkpoint=None, state=None):
+    """Yield (labels, key, pk_type, address) for every candidate whose address is a target.
+
+    The candidates of the named strategies (see parse_candidate) are
+    checked in one stream: invalid candidates are dropped and a key that
+    was already yielded by any strategy is not checked again, only its
+    label is added to the labels of the key and its address formats.  A
+    candidate with the same key and formats as an earlier one counts as a
+    duplicate.  A match is reported with the labels whose formats allow
+    its pk_type, and not at all if there are none.  If stats is a dict its 'candidates',
+    'invalid' and 'duplicates' counts are updated as candidates are
+    consumed.  With workers other than 1 the keys are checked by
+    check_keys_parallel (workers=None: all cores, affinity as there), or
+    with shared_memory=True by check_keys_shared, which passes the keys
+    through shared-memory rings tagged with the index of their strategy.
+    stop_on_hit=True ends the run at the first hit (in parallel, once the
+    batches that are being checked at that moment are done).
+
+    A Checkpoint gets the cursor of the last key known to be checked (the
+    index of its strategy in names and the number of that strategy's
+    candidates consumed), the stats at that point and the hits so far as
+    [labels, key hex, pk_type, address].  state is such a saved state to
+    resume from; the keys before its cursor are not deduplicated against,
+    and its hits are not reported again.
+    The shared-memory rings complete out of order, so they take no
+    checkpoints.
+    """
+    if shared_memory and checkpoint:
+        raise ValueError('Checkpoints need workers=1 or the pickled transport')
+    fields = ('candidates', 'invalid', 'duplicates')
+    stats = {} if stats is None else stats
+    for field in fields:
+        stats.setdefault(field, 0)
+    labels = {}
+
+    first, skip = 0, 0
+    found = []
+    if state:
+        (first, skip), found = state['cursor'], state['hits']
+        stats.update(state['stats'])
+    cursor = (first, skip) + tuple(stats[field] for field in fields)
+    unchecked = collections.deque()     # cursor after each key not yet known to be checked
+    checked = 0                         # keys of the stream known to be checked
+    check_stats = {'done': 0}
+
+    def current():
+        strategy_id, position, *counts = cursor
+        return {'cursor': [strategy_id, position], 'stats': dict(zip(fields, counts)),
+                'hits': found}
+
+    def advance(done):
+        nonlocal cursor, checked
+        while checked < done:
+            cursor = unchecked.popleft()
+            checked += 1
+        if checkpoint:
+            checkpoint.update(cursor[2], current)
+
+    def distinct_keys():
+        for strategy_id in range(first, len(names)):
+            start = skip if strategy_id == first else 0
+            candidates = itertools.islice(STRATEGIES[names[strategy_id]][1](), start, None)
+            for position, (label, candidate) in enumerate(candidates, start + 1):
+                stats['candidates'] += 1
+                parsed = None if candidate is None else parse_candidate(candidate)
+                if parsed is None:
+                    stats['invalid'] += 1
+                    continue
+                key, formats = parsed
+                if key in labels:
+                    if formats in labels[key]:
+                        stats['duplicates'] += 1
+                    labels[key].setdefault(formats, []).append(label)
+                else:
+                    labels[key] = {formats: [label]}
+                    # check_keys takes a batch once it is full, so the keys of
+                    # the full batches before this one are checked by now
+                    queued = checked + len(unchecked)
+                    advance(queued - queued % batch_size if workers == 1 else check_stats['done'])
+                    unchecked.append((strategy_id, position) + tuple(stats[f] for f in fields))
+                    yield strategy_id, key
+
+    keys = (key for _, key in distinct_keys())
+    if workers == 1:
+        hits = check_keys(keys, targets, batch_size)
+    elif shared_memory:
+        hits = ((key, pk_type, address) for _, key, pk_type, address in check_keys_shared(
+            distinct_keys(), targets, workers, batch_size, affinity=affinity, stop_on_hit=stop_on_hit))
+    else:
+        hits = check_keys_parallel(keys, targets, workers, batch_size, affinity=affinity,
+                                   stop_on_hit=stop_on_hit, stats=check_stats)
+    try:
+        for key, pk_type, address in hits:
+            hit_labels = [label for formats, group in labels[key].items() if pk_type in formats
+                          for label in group]
+            if not hit_labels:
+                continue    # a WIF whose compression flag rules out pk_type
+            if any(hit[1:3] == [key.hex(), pk_type] for hit in found):
+                continue    # in a batch checked again after resuming
+            found.append([hit_labels, key.hex(), pk_type, address])
+            yield hit_labels, key, pk_type, address
+            if stop_on_hit and workers == 1:
+                return
+        # Every key is checked: the cursor is past the last strategy
+        advance(checked + len(unchecked))
+        cursor = (len(names), 0) + tuple(stats[field] for field in fields)
+    finally:
+        # Also on errors and interrupts: the cursor covers checked keys only
+        if checkpoint:
+            checkpoint.save(current(), cursor[2])
+
+# Shared derivations of the key material
+def combined_block():
+    return blocks.dbbi_block() + blocks.faed_block()
+
+def otp_result():
+    return otp_decrypt(blocks.dbbi_block(), OTP_KEY)
+
+def letters_mod16(text):
+    """A=0 ... P=15, Q=0 ... for upper case letters."""
+    return ''.join(format((ord(c) - ord('A')) % 16, 'x') for c in text)
+
+def block_digits(text):
+    """a=0 ... i=8 as hex digits for the a-i blocks."""
+    return ''.join(format(ord(c) - ord('a'), 'x') for c in text)
+
+def faed_hex():
+    """The a-f characters of the FAED block."""
+    return ''.join(c for c in blocks.faed_block() if c in 'abcdef')
+
+def xor_hex(h1, h2):
+    """XOR two hex strings, h2 repeated to the length of h1."""
+    if len(h1) != len(h2):
+        h2 = (h2 * (len(h1) // len(h2) + 1))[:len(h1)]
+    return ''.join(format(int(a, 16) ^ int(b, 16), 'x') for a, b in zip(h1, h2))
+
+# OTP letters
+@strategy('otp-letter-maps', 'otp', 'key-search', 'final-search', 'deep-analysis')
+def otp_letter_maps():
+    """Letter-to-hex mappings of the 64 OTP characters."""
+    otp_64 = blocks.otp_64()
+
+    def keep_valid(c):
+        # a-f kept, g-j -> 0-3, k-n -> 4-7, o-r -> 8-11 (two digits for q and r)
+        c = c.lower()
+        if c in 'abcdef':
+            return c
+        if c in 'ghijklmnopqr':
+            return str('ghijklmnopqr'.index(c))
+        return format((ord(c) - ord('a')) % 16, 'x')
+
+    def mod10_keep(c):
+        idx = ord(c) - ord('A')
+        return format(idx % 10, 'x') if idx >= 6 else c.lower()
+
+    def a_to_p_hex(c):
+        # A-P = 0-f, Q-Z = 0-9
+        if 'A' <= c <= 'P':
+            return format(ord(c) - ord('A'), 'x')
+        return str((ord(c) - ord('Q')) % 10)
+
+    yield "OTP mod16", letters_mod16(otp_64)
+    yield "OTP mod10+a", ''.join(map(mod10_keep, otp_64))
+    yield "OTP convert_keep_valid", ''.join(map(keep_valid, otp_64))
+    yield "OTP A-P hex", ''.join(map(a_to_p_hex, otp_64))
+
+@strategy('otp-full', 'otp', 'last-attempt')
+def otp_full():
+    """Windows of the mod-16 hex of all 91 OTP characters."""
+    full_hex = letters_mod16(otp_result())
+    yield "Full OTP first 64", full_hex[:64]
+    yield "Full OTP last 64", full_hex[-64:]
+    yield "Full OTP 27-91", full_hex[27:91]
+
+@strategy('otp-transforms', 'otp', 'transforms', 'final-search')
+def otp_transforms():
+    """Reorderings and the complement of the OTP mod-16 key."""
+    key = letters_mod16(blocks.otp_64())
+    for name, transform in KEY_TRANSFORMS.items():
+        yield f"OTP hex {name}", transform(key)
+    complement = ''.join(format(15 - int(c, 16), 'x') for c in key)
+    yield "OTP hex complement", complement
+    yield "OTP interleaved with complement", ''.join(key[i] + complement[i] for i in range(32))
+
+@strategy('otp-nibble-variants', 'otp', 'variations', 'final-search')
+def otp_nibble_variants():
+    """The OTP mod-16 key with its first or last nibble replaced."""
+    key = letters_mod16(blocks.otp_64())
+    for i in range(16):
+        yield f"First nibble = {i:x}", format(i, 'x') + key[1:]
+    for i in range(16):
+        yield f"Last nibble = {i:x}", key[:-1] + format(i, 'x')
+
+# FAED block
+@strategy('faed-hex-windows', 'faed', 'key-search', 'final-search')
+def faed_hex_windows():
+    """First, middle and last 64 of the a-f characters of FAED."""
+    hex_chars = faed_hex()
+    if len(hex_chars) >= 64:
+        mid = (len(hex_chars) - 64) // 2
+        yield "FAED first 64", hex_chars[:64]
+        yield "FAED last 64", hex_chars[-64:]
+        yield "FAED middle 64", hex_chars[mid:mid + 64]
+
+@strategy('bifid-keywords', 'bifid', 'faed', 'key-search')
+def bifid_keywords():
+    """a-f characters of the FAED block Bifid-decrypted under a few keywords."""
+    for keyword in ['dbifhceg', 'abcdefghi', 'matrixsum', 'btcseed']:
+        decrypted = bifid_decrypt(blocks.faed_block(), create_square(keyword))
+        hex_chars = ''.join(c for c in decrypted if c in 'abcdef')
+        if len(hex_chars) >= 64:
+            yield f"Bifid({keyword}) hex", hex_chars[:64]
+
+# Dots pattern
+@strategy('dots-padded', 'dots', 'key-search')
+def dots_padded():
+    """Combined-block characters at the 0 then 1 positions, repeated to 64 digits."""
+    combined = combined_block()
+    selected = ''.join(combined[i] for i in POS_0 + POS_1 if i < len(combined))
+    if len(selected) == len(NON_DOT):
+        padded = (selected * 2)[:64]
+        yield "Dots pattern padded", ''.join(
+            format(ord(c) - ord('a'), 'x') if c in 'abcdefghi' else '0' for c in padded)
+
+@strategy('dots-binary', 'dots', 'key-search', 'final-search')
+def dots_binary():
+    """The 0/1 digits of the dots pattern as a number, and the pattern XORed into the OTP key."""
+    digits = ''.join(d for d in DOTS if d != '.')
+    yield "Binary from dots padded", format(int(digits, 2), '064x')
+    bits = ''.join('1' if d == '1' else '0' for d in DOTS)
+    dots_hex = format(int(bits.ljust(256, '0')[:256], 2), '064x')
+    yield "OTP XOR dots_binary", xor_hex(letters_mod16(blocks.otp_64()), dots_hex)
+
+@strategy('dots-select', 'dots', 'faed', 'otp', 'key-search', 'advanced-search', 'final-search')
+def dots_select():
+    """Characters at the non-dot positions of FAED, its hexdump and the OTP letters."""
+    faed = blocks.faed_block()
+    yield "Dots-selected from FAED", block_digits(faed[i] for i in NON_DOT).ljust(64, '0')[:64]
+    hexdump = bytes(ord(c) - ord('a') for c in combined_block()).hex()
+    yield "Dots-extracted from hexdump (padded)", ''.join(hexdump[i] for i in NON_DOT).ljust(64, '0')
+    otp_hex = letters_mod16(blocks.otp_64())
+    extracted = letters_mod16(blocks.otp_64()[i % 64] for i in NON_DOT)
+    yield "Dots-extracted + OTP remainder", extracted + otp_hex[len(extracted):]
+
+# Combined DBBI + FAED block
+@strategy('combined-hex', 'combined', 'advanced-search', 'final-search')
+def combined_hex():
+    """The first 64 digits of the combined block under a-i digit mappings."""
+    combined = combined_block()
+    yield "Hexdump first 64", bytes(ord(c) - ord('a') for c in combined).hex()[:64]
+    yield "Block hex V1", combined.translate(str.maketrans('ghi', '012'))[:64]
+    yield "Block hex V2", combined.translate(str.maketrans('ghi', '789'))[:64]
+    # Pairs of a-i digits as base-9 bytes
+    digits = [ord(c) - ord('a') for c in combined[:64]]
+    yield "Combined V2 pairs", bytes(9 * a + b for a, b in zip(digits[0::2], digits[1::2])).hex()
+
+@strategy('combined-stride', 'combined', 'advanced-search', 'deep-analysis')
+def combined_stride():
+    """Every 10th to 13th character of the combined block."""
+    combined = combined_block()
+    for step in [10, 11, 12, 13]:
+        selected = combined[::step][:64]
+        if len(selected) == 64:
+            yield f"Every {step}th", block_digits(selected)
+
+@strategy('combined-base9', 'combined', 'last-attempt')
+def combined_base9():
+    """The first 64 combined characters as a base-9 number."""
+    number = format(int(block_digits(combined_block()[:64]), 9), 'x')
+    if len(number) >= 64:
+        yield "Base9 to hex first 64", number[:64]
+        yield "Base9 to hex last 64", number[-64:]
+
+# XOR of the key materials
+@strategy('xor-combos', 'xor', 'otp', 'faed', 'key-search', 'final-search', 'last-attempt')
+def xor_combos():
+    """The OTP letters XORed with the FAED block and with the OTP key."""
+    otp_64 = blocks.otp_64()
+    faed = blocks.faed_block()
+    values = lambda text: bytes(ord(c.lower()) - ord('a') for c in text if c.isalpha())
+    yield "XOR OTP^FAED", bytes(a ^ b for a, b in zip(values(otp_64), values(faed[:64]))).hex()[:64]
+    yield "OTP XOR FAED_hex", xor_hex(letters_mod16(otp_64), faed_hex()[:64])
+    letter = lambda c: ord(c.upper()) - ord('A') if c.isalpha() else 0
+    yield "OTP64 XOR OTP_key", ''.join(
+        format((letter(a) ^ letter(b)) % 16, 'x') for a, b in zip(otp_64, OTP_KEY))
+
+# Hashes of the texts
+@strategy('sha256-phrases', 'sha256', 'key-search', 'final-search', 'last-attempt', 'deep-analysis')
+def sha256_phrases():
+    """SHA-256 (and double SHA-256) of the texts and phrases of the puzzle."""
+    dbbi = blocks.dbbi_block()
+    faed = blocks.faed_block()
+    combined = dbbi + faed
+    otp_64 = blocks.otp_64()
+    result = otp_result()
+    phrases = [
+        otp_64, result, dbbi, faed, combined, "YOUWON" + otp_64,
+        ''.join(combined[i] for i in POS_0 + POS_1), "btcseed", "matrixsumlist",
+        letters_mod16(otp_64), otp_64.lower(), result.lower(), dbbi + OTP_KEY[:91],
+        faed[:64], combined[:64], otp_64 + "YOUWON", OTP_KEY, TARGET,
+        "YOUWON", "youwon", "gsmg.io", "theseedisplanted",
+        "theflowerblossomsthroughwhatseemstobeaconcretesurface",
+    ]
+    for phrase in dict.fromkeys(phrases):
+        yield f"SHA256({phrase[:20]}...)", hashlib.sha256(phrase.encode()).digest()
+    yield "Double SHA256(OTP64)", hashlib.sha256(hashlib.sha256(otp_64.encode()).digest()).digest()
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('selectors', nargs='*', metavar='NAME|TAG', help='strategies or tags to run')
+    parser.add_argument('--list', action='store_true', help='list the strategies and tags')
+    parser.add_argument('--batch', type=int, default=BATCH_SIZE, help='keys per EC batch')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (0: all cores)')
+    parser.add_argument('--affinity', action='store_true', help='pin each worker process to one CPU')
+    parser.add_argument('--shared-memory', action='store_true',
+                        help='pass keys to the workers through shared-memory rings')
+    parser.add_argument('--stop-on-hit', action='store_true', help='stop all workers at the first match')
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    parser.add_argument('--solution-file', help='write the matches to this file')
+    add_checkpoint_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.list:
+        width = max(map(len, STRATEGIES))
+        for name, (tags, fn) in STRATEGIES.items():
+            print(f"{name:<{width}}  {fn.__doc__.strip().splitlines()[0]}")
+            print(f"{'':<{width}}  tags: {', '.join(sorted(tags))}")
+        return
+    try:
+        names = select_strategies(args.selectors)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.checkpoint and args.shared_memory and args.workers != 1:
+        parser.error('--checkpoint does not work with --shared-memory')
+    checkpoint, state = open_checkpoint(parser, args, {
+        'command': 'strategies', 'strategies': names, 'target': args.target, 'index': args.index})
+
+    print("=" * 70)
+    print("STRATEGY SEARCH")
+    print("=" * 70)
+    print(f"Strategies: {', '.join(names)}")
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    stats = {}
+    hits = []
+    if state:
+        strategy_id, position = state['cursor']
+        hits = [(labels, bytes.fromhex(key), pk_type, address)
+                for labels, key, pk_type, address in state['hits']]
+        where = (f"{names[strategy_id]} after {position:,} candidates"
+                 if strategy_id < len(names) else "the end")
+        print(f"Resuming at {where}: {state['stats']['candidates']:,} candidates done, "
+              f"{len(hits)} match(es) so far")
+    began = time.time()
+    matches = run_strategies(names, targets, args.batch, stats, args.workers or None,
+                             args.affinity, args.stop_on_hit, args.shared_memory,
+                             checkpoint, state)
+    for labels, key, pk_type, address in matches:
+        print(f"\n{'='*70}")
+        print(f"FOUND MATCH: {', '.join(labels)}")
+        print(f"Key: {key.hex()}")
+        print(f"Type: {pk_type}")
+        print(f"Address: {address}")
+        print(f"{'='*70}")
+        hits.append((labels, key, pk_type, address))
+        if args.solution_file:
+            with open(args.solution_file, 'a' if len(hits) > 1 else 'w') as f:
+                f.write(f"Method: {', '.join(labels)}\n")
+                f.write(f"Private Key: {key.hex()}\n")
+                f.write(f"Address: {address}\n")
+    elapsed = time.time() - began
+
+    distinct = stats['candidates'] - stats['invalid'] - stats['duplicates']
+    print("\n" + "=" * 70)
+    print(f"Search complete. {stats['candidates']:,} candidates from {len(names)} strategies "
+          f"in {elapsed:.1f}s, {distinct:,} distinct keys, {stats['duplicates']:,} duplicates, "
+          f"{stats['invalid']:,} invalid, {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
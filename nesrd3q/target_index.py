@@ -0,0 +1,50 @@
+"""
+Build and query sorted hash160 target index files
+An index holds the decoded hash160s / witness programs of a target address
+list (one address or millions), sorted for interpolation search and with a
+Bloom filter in front.  Scanners match raw hashes against it and only
+base58/bech32-encode the hits.
+
+Usage: nesrd3q target-index build ADDRESS_FILE [-o INDEX] [--skip-invalid]
+       nesrd3q target-index query INDEX ADDR ...
+ADDRESS_FILE has one address per line; '#' starts a comment.
+"""
+
+import argparse
+import time
+
+from .core import *
+
+DEFAULT_INDEX = 'targets.idx'
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='decode an address list into an index file')
+    build.add_argument('addresses', help='text file with one address per line')
+    build.add_argument('-o', '--output', default=DEFAULT_INDEX, help=f'index file (default: {DEFAULT_INDEX})')
+    build.add_argument('--skip-invalid', action='store_true', help='skip undecodable lines instead of failing')
+    query = commands.add_parser('query', help='look addresses up in an index file')
+    query.add_argument('index')
+    query.add_argument('address', nargs='+')
+    query.add_argument('--search', choices=('interpolation', 'binary'), default='interpolation')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        began = time.time()
+        count, skipped = build_target_index(read_address_list(args.addresses), args.output,
+                                            args.skip_invalid)
+        index = TargetIndex(args.output)
+        print(f"Indexed {count:,} targets ({', '.join(index.spaces) or 'empty'}) "
+              f"in {time.time() - began:.1f}s -> {args.output}")
+        if skipped:
+            print(f"Skipped {skipped:,} invalid lines")
+    else:
+        index = TargetIndex(args.index, args.search)
+        for address in args.address:
+            space, program = decode_address(address)
+            found = program in index.space(space)
+            print(f"{address}: {'FOUND' if found else 'not found'} ({space})")
+
+if __name__ == '__main__':
+    main()
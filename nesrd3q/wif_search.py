@@ -0,0 +1,66 @@
+"""
+WIF candidate search over local text files
+Every whitespace-separated token is tried as a mainnet WIF private key.
+Tokens of the wrong length, with characters outside the base58 alphabet or
+with a bad version byte, suffix or double-SHA256 checksum are discarded
+before any EC work; a valid key is only checked in the address formats of
+its compression flag (uncompressed P2PKH for 51 characters, the compressed
+formats for 52).
+
+Usage: nesrd3q wif-search FILE ... [--batch B] [--target ADDR ... | --index FILE]
+FILE may be - for stdin.
+"""
+
+import argparse
+import sys
+import time
+
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+def read_tokens(paths):
+    """Yield the whitespace-separated tokens of the given files (- is stdin)."""
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', errors='replace')
+        try:
+            for line in f:
+                yield from line.split()
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='+', help='text files (- for stdin)')
+    parser.add_argument('--batch', type=int, default=BATCH_SIZE, help='valid keys per EC batch')
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("WIF CANDIDATE SEARCH")
+    print("=" * 70)
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    stats = {}
+    hits = []
+    began = time.time()
+    for wif, pk_type, address in check_wifs(read_tokens(args.files), targets, args.batch, stats):
+        print(f"\n{'='*70}")
+        print("FOUND MATCH")
+        print(f"WIF: {wif}")
+        print(f"Key: {wif_decode(wif)[0]:064x}")
+        print(f"Type: {pk_type}")
+        print(f"Address: {address}")
+        print(f"{'='*70}")
+        hits.append((wif, pk_type, address))
+    elapsed = time.time() - began
+
+    print("\n" + "=" * 70)
+    print(f"Search complete. {stats['valid'] + stats['rejected']:,} tokens in {elapsed:.1f}s, "
+          f"{stats['valid']:,} valid WIF keys, {stats['rejected']:,} rejected, {len(hits)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
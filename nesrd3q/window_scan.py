@@ -0,0 +1,149 @@
+"""
+Rolling-window key scan over the dbbi/faed blocks
+Every 64-digit window of every block representation is tried as a key, in
+both reading directions.  Shifting the window by one digit updates the
+public key with P' = 16*(P - top*16^63*G) + new*G instead of a fresh scalar
+multiplication.
+
+Usage: nesrd3q window-scan [--types FORMATS] [--target ADDR ... | --index FILE]
+"""
+
+import argparse
+import time
+
+from .blocks import dbbi_block, faed_block
+from .core import *
+
+TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"
+
+WINDOW = 64
+
+def ai_to_hex_v1(text):
+    """a-f as hex, g=0, h=1, i=2"""
+    mapping = {'a':'a', 'b':'b', 'c':'c', 'd':'d', 'e':'e', 'f':'f', 'g':'0', 'h':'1', 'i':'2'}
+    return ''.join(mapping.get(c, '0') for c in text)
+
+def block_to_hex_v2(text):
+    """a-f as hex, g=7, h=8, i=9"""
+    mapping = {'a':'a', 'b':'b', 'c':'c', 'd':'d', 'e':'e', 'f':'f', 'g':'7', 'h':'8', 'i':'9'}
+    return ''.join(mapping.get(c, '0') for c in text)
+
+def ai_to_digits(text):
+    """a=0, b=1, ..., i=8 (base-9 digit string, also the "hexdump" nibbles)"""
+    return ''.join(str(ord(c) - ord('a')) for c in text)
+
+def hex_only(text):
+    """Keep only the characters that are already hex (a-f)"""
+    return ''.join(c for c in text if c in 'abcdef')
+
+REPRESENTATIONS = {
+    'V1 (g=0,h=1,i=2)': ai_to_hex_v1,
+    'V2 (g=7,h=8,i=9)': block_to_hex_v2,
+    'digits (a=0..i=8)': ai_to_digits,
+    'hex-only (a-f)': hex_only,
+}
+
+def load_sequences():
+    """All (label, hex string) sequences to scan, forward and reversed."""
+    blocks = {'DBBI': dbbi_block(), 'FAED': faed_block(), 'combined': dbbi_block() + faed_block()}
+    sequences = []
+    for block_name, block in blocks.items():
+        for rep_name, convert in REPRESENTATIONS.items():
+            digits = convert(block)
+            if len(digits) < WINDOW:
+                continue
+            sequences.append((f"{block_name} {rep_name}", digits))
+            sequences.append((f"{block_name} {rep_name} reversed", digits[::-1]))
+    return sequences
+
+def shift_points():
+    """Affine points -t*16^63*G and v*G for t, v in 1..15."""
+    top = 16 ** (WINDOW - 1)
+    jacobians = [fixed_base_mult_jacobian(-t * top) for t in range(1, 16)]
+    jacobians += [fixed_base_mult_jacobian(v) for v in range(1, 16)]
+    affine = batch_from_jacobian(jacobians, SECP256K1_P)
+    return [None] + affine[:15], [None] + affine[15:]
+
+def window_points(digits, batch_size=BATCH_SIZE):
+    """Yield (offset, key, point) for every 64-digit window of digits."""
+    p = SECP256K1_P
+    remove, add = shift_points()
+    top = 16 ** (WINDOW - 1)
+
+    key = int(digits[:WINDOW], 16)
+    current = fixed_base_mult_jacobian(key)
+    pending = [(0, key)]
+    points = [current]
+    for offset in range(1, len(digits) - WINDOW + 1):
+        t = int(digits[offset - 1], 16)
+        v = int(digits[offset + WINDOW - 1], 16)
+        key = 16 * (key - t * top) + v
+        current = jacobian_add_affine(current, remove[t], p)
+        for _ in range(4):
+            current = jacobian_double(current, p)
+        current = jacobian_add_affine(current, add[v], p)
+        pending.append((offset, key))
+        points.append(current)
+        if len(points) >= batch_size:
+            for (o, k), pt in zip(pending, batch_from_jacobian(points, p)):
+                yield o, k, pt
+            pending, points = [], []
+    for (o, k), pt in zip(pending, batch_from_jacobian(points, p)):
+        yield o, k, pt
+
+def scan_sequence(digits, wanted, formats=P2PKH_FORMATS):
+    """Return (windows tested, [(offset, key_hex, pk_type, address)]).
+
+    wanted is a target_programs() dict and formats the address formats to
+    derive.
+    """
+    tested = 0
+    hits = []
+    for offset, key, point in window_points(digits):
+        if point is None:
+            continue
+        tested += 1
+        for fmt, program in point_to_programs(point, formats):
+            if program in wanted[FORMAT_SPACES[fmt]]:
+                hits.append((offset, format(key, '064x'), fmt, program_to_address(fmt, program)))
+    return tested, hits
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--types', default='uncompressed,compressed',
+                        help='comma-separated address formats to check: ' + ','.join(ADDRESS_FORMATS))
+    parser.add_argument('--target', action='append', help='target address (repeatable)')
+    parser.add_argument('--index', help='target index file (see nesrd3q target-index)')
+    args = parser.parse_args(argv)
+
+    targets = open_target_index(args.index) if args.index else args.target or [TARGET]
+    wanted = target_programs(targets)
+    formats = enabled_formats(wanted, tuple(args.types.split(',')))
+
+    print("=" * 70)
+    print("ROLLING-WINDOW SCAN")
+    print("=" * 70)
+
+    total = 0
+    found = []
+    began = time.time()
+    for label, digits in load_sequences():
+        tested, hits = scan_sequence(digits, wanted, formats)
+        total += tested
+        print(f"  {label:<40} {tested:5d} windows")
+        for offset, key, pk_type, addr in hits:
+            print(f"\n{'='*70}")
+            print(f"FOUND MATCH: {label} offset {offset}")
+            print(f"Key: {key}")
+            print(f"Type: {pk_type}")
+            print(f"Address: {addr}")
+            print(f"{'='*70}")
+            found.append((label, offset, key, pk_type, addr))
+
+    elapsed = time.time() - began
+    print("\n" + "=" * 70)
+    print(f"Scan complete. {total:,} windows in {elapsed:.1f}s, {len(found)} match(es).")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -4,82 +4,12 @@ Bitcoin Private Key Validation
 Generate Bitcoin address from private key and compare to target
 """
 
-import hashlib
-import ecdsa
+# Shared validation code; the EC backend (pure, ecdsa or coincurve) is
+# picked on first use, see select_ec_backend()
+from nesrd3q.core import *
 
-def private_key_to_address(private_key_hex):
-    """Convert a hex private key to a Bitcoin address."""
-    try:
-        # Convert hex to bytes
-        private_key_bytes = bytes.fromhex(private_key_hex)
-        
-        # Generate public key using ECDSA secp256k1
-        sk = ecdsa.SigningKey.from_string(private_key_bytes, curve=ecdsa.SECP256k1)
-        vk = sk.get_verifying_key()
-        
-        # Uncompressed public key (04 + x + y)
-        public_key_uncompressed = b'\x04' + vk.to_string()
-        
-        # Also try compressed public key
-        x = vk.to_string()[:32]
-        y = vk.to_string()[32:]
-        if y[-1] % 2 == 0:
-            public_key_compressed = b'\x02' + x
-        else:
-            public_key_compressed = b'\x03' + x
-        
-        addresses = []
-        
-        for pk_type, public_key in [('uncompressed', public_key_uncompressed), 
-                                     ('compressed', public_key_compressed)]:
-            # SHA256
-            sha256_hash = hashlib.sha256(public_key).digest()
-            
-            # RIPEMD160
-            ripemd160 = hashlib.new('ripemd160')
-            ripemd160.update(sha256_hash)
-            hash160 = ripemd160.digest()
-            
-            # Add version byte (0x00 for mainnet)
-            versioned = b'\x00' + hash160
-            
-            # Double SHA256 for checksum
-            checksum = hashlib.sha256(hashlib.sha256(versioned).digest()).digest()[:4]
-            
-            # Combine
-            address_bytes = versioned + checksum
-            
-            # Base58 encode
-            address = base58_encode(address_bytes)
-            addresses.append((pk_type, address))
-        
-        return addresses
-    except Exception as e:
-        return [('error', str(e))]
-
-def base58_encode(data):
-    """Base58 encode bytes."""
-    alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
-    
-    # Count leading zeros
-    leading_zeros = 0
-    for byte in data:
-        if byte == 0:
-            leading_zeros += 1
-        else:
-            break
-    
-    # Convert to integer
-    num = int.from_bytes(data, 'big')
-    
-    # Encode
-    result = ''
-    while num > 0:
-        num, rem = divmod(num, 58)
-        result = alphabet[rem] + result
-    
-    # Add leading 1s
-    return '1' * leading_zeros + result
+if __name__ == '__main__':
+    use_key_cache()
 
 # Target address
 TARGET = "1GSMG1JC9wtdSwfwApgj2xcmJPAwx7prBe"